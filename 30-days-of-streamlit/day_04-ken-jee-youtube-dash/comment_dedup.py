@@ -0,0 +1,226 @@
+"""
+Near-duplicate / spam comment detection with MinHash LSH.
+
+Comments are read in chunks, MinHash signatures are computed per chunk
+(vectorized over all shingles of a batch), then near-duplicates are grouped
+with banded locality-sensitive hashing over the whole file. Chunks are hashed
+in this process by default; with more workers, in a spawned process pool.
+
+Every comment gets a `Cluster_ID` (the row number of the cluster's first
+comment) and an `Is_Spam` flag. Short comments ("Thanks Ken!", "Great
+video!") share too few shingles to tell copies from coincidences, so they
+are never clustered. A copy after the first in a cluster is flagged only
+when the cluster is repeated by the same author or spans several videos:
+the same long text from different people under one video is not spam.
+
+To run on its own:
+> python comment_dedup.py data/All_Comments_Final.csv -o data/All_Comments_Flagged.csv
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+NUM_BANDS = 16  # 16 bands x 4 rows -> candidate threshold ~0.5 Jaccard
+SEED = 42
+# Comments shorter than this (normalized) are never clustered
+MIN_CHARS = 40
+
+_whitespace = re.compile(r"\s+")
+
+
+def _permutations(num_perm: int = NUM_PERM, seed: int = SEED):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    return a, b
+
+
+def normalize(text: str) -> str:
+    return _whitespace.sub(" ", str(text).lower()).strip()
+
+
+def shingle_hashes(text: str, k: int = SHINGLE_SIZE) -> np.ndarray:
+    """Hash every k-byte shingle of a normalized comment into uint32"""
+    norm = normalize(text).encode()
+    data = np.frombuffer(norm, dtype=np.uint8).astype(np.uint64)
+    if data.size == 0:
+        return data
+    if data.size < k:
+        data = np.pad(data, (0, k - data.size))
+    windows = np.lib.stride_tricks.sliding_window_view(data, k)
+    powers = np.uint64(257) ** np.arange(k, dtype=np.uint64)
+    return np.unique((windows @ powers) & np.uint64(0xFFFFFFFF))
+
+
+def minhash_signatures(
+    texts: list[str], num_perm: int = NUM_PERM, seed: int = SEED, batch_size: int = 256
+) -> np.ndarray:
+    """MinHash signatures (len(texts) x num_perm, uint32) for a list of texts.
+
+    Empty texts get an all-max signature and are never clustered.
+    """
+    a, b = _permutations(num_perm, seed)
+    empty = np.iinfo(np.uint32).max
+    signatures = np.full((len(texts), num_perm), empty, dtype=np.uint32)
+
+    for lo in range(0, len(texts), batch_size):
+        shingles = [shingle_hashes(t) for t in texts[lo : lo + batch_size]]
+        sizes = np.array([s.size for s in shingles])
+        rows = np.flatnonzero(sizes)
+        if rows.size == 0:
+            continue
+        flat = np.concatenate([shingles[r] for r in rows])
+        offsets = np.concatenate(([0], np.cumsum(sizes[rows])[:-1]))
+        # (num_perm x total shingles) universal hashes, min-reduced per comment
+        hashed = (a[:, None] * flat[None, :] + b[:, None]) % MERSENNE_PRIME
+        signatures[lo + rows] = np.minimum.reduceat(hashed, offsets, axis=1).T
+    return signatures
+
+
+def _chunk_signatures(texts: list[str], min_chars: int = MIN_CHARS) -> np.ndarray:
+    # Too short to cluster: blank, so the signature stays empty
+    return minhash_signatures(
+        [t if len(normalize(t)) >= min_chars else "" for t in texts]
+    )
+
+
+def _find(parent: np.ndarray, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def lsh_clusters(
+    signatures: np.ndarray, num_bands: int = NUM_BANDS, threshold: float = 0.8
+) -> np.ndarray:
+    """Group near-duplicate signatures, returning the cluster root of each row.
+
+    Rows sharing a band bucket are candidates; a candidate pair is merged only
+    when the estimated Jaccard similarity is at least `threshold`.
+    """
+    n, num_perm = signatures.shape
+    rows_per_band = num_perm // num_bands
+    parent = np.arange(n)
+    valid = signatures[:, 0] != np.iinfo(np.uint32).max
+
+    for band in range(num_bands):
+        block = np.ascontiguousarray(
+            signatures[valid, band * rows_per_band : (band + 1) * rows_per_band]
+        )
+        keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows_per_band)))
+        _, bucket = np.unique(keys.ravel(), return_inverse=True)
+        order = np.argsort(bucket, kind="stable")
+        members = np.flatnonzero(valid)[order]
+        bucket = bucket[order]
+        # Pair every bucket member with the first member of its bucket
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        first = starts[np.searchsorted(starts, np.arange(len(bucket)), "right") - 1]
+        left, right = members[first], members
+        pairs = left != right
+        left, right = left[pairs], right[pairs]
+        similar = (signatures[left] == signatures[right]).mean(axis=1) >= threshold
+        for i, k in zip(left[similar], right[similar]):
+            ri, rk = _find(parent, i), _find(parent, k)
+            if ri != rk:
+                parent[max(ri, rk)] = min(ri, rk)
+
+    return np.array([_find(parent, i) for i in range(n)])
+
+
+def flag_duplicate_comments(
+    file_path: Path,
+    text_col: str = "Comments",
+    author_col: str = "user_ID",
+    video_col: str = "VidId",
+    chunksize: int = 2_000,
+    max_workers: int | None = 1,
+    threshold: float = 0.8,
+    min_chars: int = MIN_CHARS,
+) -> pd.DataFrame:
+    """Stream `file_path` in chunks and flag near-duplicate comments.
+
+    Returns a frame aligned with the CSV rows with `Cluster_ID` and `Is_Spam`.
+    `max_workers=None` hashes on every CPU; one worker (the default) is as
+    fast on a file of ~10k comments, without starting processes.
+    """
+    chunks = pd.read_csv(
+        file_path, usecols=[text_col, author_col, video_col], chunksize=chunksize
+    )
+    workers = max_workers or os.cpu_count() or 1
+    authors, videos, parts = [], [], []
+    with ExitStack() as stack:
+        pool = None
+        if workers > 1:
+            # Spawned workers: forking a threaded Streamlit server is not safe
+            pool = stack.enter_context(
+                ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            )
+        for chunk in chunks:
+            authors.append(chunk[author_col])
+            videos.append(chunk[video_col])
+            texts = chunk[text_col].fillna("").tolist()
+            if pool is None:
+                parts.append(_chunk_signatures(texts, min_chars))
+            else:
+                parts.append(pool.submit(_chunk_signatures, texts, min_chars))
+        if pool is not None:
+            parts = [future.result() for future in parts]
+    signatures = (
+        np.concatenate(parts) if parts else np.empty((0, NUM_PERM), dtype=np.uint32)
+    )
+
+    cluster_id = lsh_clusters(signatures, threshold=threshold)
+    flags = pd.DataFrame(
+        {
+            "Cluster_ID": cluster_id,
+            "Author": pd.concat(authors, ignore_index=True) if authors else [],
+            "Video": pd.concat(videos, ignore_index=True) if videos else [],
+        }
+    )
+    clusters = flags.groupby("Cluster_ID")
+    repeated = (
+        flags.groupby(["Cluster_ID", "Author"])["Video"].transform("size") > 1
+    ) | (clusters["Video"].transform("nunique") > 1)
+    flags["Is_Spam"] = (cluster_id != np.arange(len(cluster_id))) & repeated
+    return flags[["Cluster_ID", "Is_Spam"]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file_path", type=Path)
+    parser.add_argument("-o", "--output", type=Path, required=True)
+    parser.add_argument("--chunksize", type=int, default=2_000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--workers", type=int, default=1, help="0 for one per CPU")
+    args = parser.parse_args()
+
+    flags = flag_duplicate_comments(
+        args.file_path,
+        chunksize=args.chunksize,
+        max_workers=args.workers or None,
+        threshold=args.threshold,
+    )
+    df = pd.concat([pd.read_csv(args.file_path), flags], axis=1)
+    df.to_csv(args.output, index=False)
+    print(
+        f"{flags['Is_Spam'].sum()} of {len(flags)} comments flagged as duplicates "
+        f"in {flags['Cluster_ID'].nunique()} clusters"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,10 @@ import streamlit as st
 from plotly import express as px
 from plotly import graph_objects as go
 
+from comment_dedup import flag_duplicate_comments
+from snapshots import diff_snapshots, list_snapshots, save_snapshot
+from view_forecasts import fit_early_view_forecasts, project_cumulative_views
+
 # functions
 
 
@@ -82,6 +86,21 @@ def add_metrics(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def add_spam_adjusted_metrics(
+    df: pd.DataFrame, df_comments: pd.DataFrame
+) -> pd.DataFrame:
+    """Engagement with near-duplicate (spam) comments taken out"""
+    spam_by_video = df_comments.groupby("VidId")["Is_Spam"].sum()
+    df["Spam comments"] = df["Video"].map(spam_by_video).fillna(0)
+    df["Engagement_ratio_dedup"] = (
+        (df["Comments added"] - df["Spam comments"]).clip(lower=0)
+        + df["Shares"]
+        + df["Dislikes"]
+        + df["Likes"]
+    ) / df["Views"]
+    return df
+
+
 def sort_by_date(
     df: pd.DataFrame, sort_col: str = "Video publish time"
 ) -> pd.DataFrame:
@@ -122,18 +141,24 @@ def load_data() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]
     data_path = Path("./data")
     file_path = data_path / "Aggregated_Metrics_By_Video.csv"
 
+    # Cluster id + spam flag for near-duplicate comments (MinHash LSH)
+    comments_path = data_path / "All_Comments_Final.csv"
+    df_comments = pd.concat(
+        [pd.read_csv(comments_path), flag_duplicate_comments(comments_path)], axis=1
+    )
+
     df_agg = (
         pd.read_csv(file_path, skiprows=1)
         .pipe(clean_column_names)
         .pipe(parse_dates_and_durations)
         .pipe(add_metrics)
+        .pipe(add_spam_adjusted_metrics, df_comments)
         .pipe(sort_by_date)
     )
 
     df_agg_sub = pd.read_csv(
         data_path / "Aggregated_Metrics_By_Country_And_Subscriber_Status.csv"
     )
-    df_comments = pd.read_csv(data_path / "All_Comments_Final.csv")
     df_time = pd.read_csv(data_path / "Video_Performance_Over_Time.csv").assign(
         Date=lambda df: pd.to_datetime(df["Date"], errors="coerce")
     )
@@ -141,7 +166,22 @@ def load_data() -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]
     return df_agg, df_agg_sub, df_comments, df_time
 
 
+@st.cache_data
+def load_view_forecasts(df_time_diff: pd.DataFrame) -> pd.DataFrame:
+    # Cached per data snapshot (st.cache_data hashes the frame)
+    return fit_early_view_forecasts(df_time_diff)
+
+
+@st.cache_data
+def load_snapshot_diff(old_path: Path, new_path: Path) -> pd.DataFrame:
+    return diff_snapshots(old_path, new_path)
+
+
 df_agg, df_agg_sub, df_comments, df_time = load_data()
+# Keep a versioned copy of every distinct export for the diff view. Outside
+# load_data: a cached call does not run again, so its side effects would not
+# either (e.g. after the snapshot folder is cleared)
+save_snapshot(df_agg)
 
 # Engineer data
 df_agg_diff = df_agg.copy()
@@ -225,6 +265,9 @@ views_cumulative = views_days.loc[
     }
 )
 
+# Forecast 30/90 day views for every video from its first week
+view_forecasts = load_view_forecasts(df_time_diff)
+
 
 ## What metrics will be relevant?
 ## Difference from baseline
@@ -232,7 +275,8 @@ views_cumulative = views_days.loc[
 
 # Build dashboard
 add_sidebar = st.sidebar.selectbox(
-    "Aggregate or Individual Video", ("Aggregate Metrics", "Individual Video Analysis")
+    "Aggregate or Individual Video",
+    ("Aggregate Metrics", "Individual Video Analysis", "Snapshot Diff"),
 )
 
 
@@ -250,6 +294,7 @@ if add_sidebar == "Aggregate Metrics":
         # "Average % viewed",
         "Avg_duration_sec",
         "Engagement_ratio",
+        "Engagement_ratio_dedup",
         "Views / sub gained",
         "Dislikes",
         "Subscribers lost",
@@ -312,6 +357,7 @@ if add_sidebar == "Aggregate Metrics":
         # "Average % viewed",
         "Avg_duration_sec",
         "Engagement_ratio",
+        "Engagement_ratio_dedup",
         "Views / sub gained",
         # "Dislikes",
         # "Subscribers lost",
@@ -413,9 +459,80 @@ if add_sidebar == "Individual Video Analysis":
             line=dict(color="firebrick", width=8),
         )
     )
+
+    video_ids = df_agg.loc[lambda x: x["Video title"] == video_select, "Video"]
+    if not video_ids.empty and video_ids.iloc[0] in view_forecasts.index:
+        forecast = view_forecasts.loc[video_ids.iloc[0]]
+        if forecast["first_day"] > 0:
+            st.caption(
+                f"No projection: daily views for this video start on day "
+                f"{forecast['first_day']:.0f}, and a fit without the earlier days "
+                "would underestimate it."
+            )
+        elif forecast.notna().all():
+            fig2.add_trace(
+                go.Scatter(
+                    x=views_cumulative["days_published"],
+                    y=project_cumulative_views(
+                        forecast, views_cumulative["days_published"].to_numpy()
+                    ),
+                    mode="lines",
+                    name="Projection",
+                    line=dict(color="firebrick", dash="dot"),
+                )
+            )
+
+            band_30 = views_cumulative.loc[
+                lambda df: df["days_published"] == df["days_published"].max()
+            ].iloc[0]
+            pct_rank_90 = (
+                view_forecasts["proj_90d_views"].dropna() < forecast["proj_90d_views"]
+            ).mean()
+            left, right = st.columns(2)
+            left.metric(
+                label="Projected 30-day views",
+                value=f"{forecast['proj_30d_views']:,.0f}",
+                delta=f"{forecast['proj_30d_views'] / band_30['median_views'] - 1:.1%} vs median",
+            )
+            right.metric(
+                label="Projected 90-day views",
+                value=f"{forecast['proj_90d_views']:,.0f}",
+                delta=f"{pct_rank_90:.0%} percentile of all videos",
+                delta_color="off",
+            )
+
     fig2.update_layout(
         title="View comparison first 30 days",
         xaxis_title="Days Since Published",
         yaxis_title="Cumulative Views",
     )
     st.plotly_chart(fig2)
+
+if add_sidebar == "Snapshot Diff":
+    snapshots = list_snapshots()
+    if len(snapshots) < 2:
+        st.info("Need at least two data exports to compare. Only one snapshot so far.")
+    else:
+        left, right = st.columns(2)
+        old_path = left.selectbox(
+            "Previous export",
+            snapshots,
+            index=len(snapshots) - 2,
+            format_func=lambda p: p.stem,
+        )
+        new_path = right.selectbox(
+            "New export",
+            snapshots,
+            index=len(snapshots) - 1,
+            format_func=lambda p: p.stem,
+        )
+        df_diff = load_snapshot_diff(old_path, new_path)
+        st.write(
+            f"{len(df_diff)} videos changed: "
+            + ", ".join(
+                f"{n} {status}"
+                for status, n in df_diff["Status"].value_counts().items()
+            )
+        )
+        # st.dataframe columns are sortable by clicking the header
+        st.dataframe(df_diff, hide_index=True)
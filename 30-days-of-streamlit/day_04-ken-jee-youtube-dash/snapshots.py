@@ -0,0 +1,120 @@
+"""
+Versioned snapshots of the per-video aggregates and a diff between two of them.
+
+Each snapshot is a parquet file holding the key columns, the tracked metrics
+and a per-row content hash. Diffing two snapshots hash-joins on the video id
+and only looks at the metric values of rows whose hash changed, so an export
+where few videos moved is cheap to compare even for very large catalogues.
+"""
+
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_DIR = Path("./data/snapshots")
+KEY_COL = "Video"
+INFO_COLS = ["Video title", "Video publish time"]
+DIFF_METRICS = [
+    "Views",
+    "Likes",
+    "Dislikes",
+    "Comments added",
+    "Shares",
+    "Subscribers gained",
+    "Subscribers lost",
+    "Subscribers",
+    "Watch time (hours)",
+    "Your estimated revenue (USD)",
+]
+
+
+def add_row_hashes(df: pd.DataFrame) -> pd.DataFrame:
+    """Add uint64 hashes of the video id (join key) and of the tracked metrics"""
+    return df.assign(
+        key_hash=pd.util.hash_pandas_object(df[KEY_COL], index=False).to_numpy(),
+        row_hash=pd.util.hash_pandas_object(df[DIFF_METRICS], index=False).to_numpy(),
+    )
+
+
+def save_snapshot(df_agg: pd.DataFrame, snapshot_dir: Path = SNAPSHOT_DIR) -> Path:
+    """Store the aggregates as a new snapshot unless identical data is stored.
+
+    Snapshot files are named `<timestamp>_<digest>.parquet`, the digest being
+    taken over the (key hash, row hash) pairs in key order, so re-loading the
+    same export is a no-op.
+    """
+    snapshot = add_row_hashes(df_agg.loc[:, [KEY_COL, *INFO_COLS, *DIFF_METRICS]])
+    pairs = snapshot[["key_hash", "row_hash"]].to_numpy()
+    digest = hashlib.sha1(
+        pairs[np.argsort(pairs[:, 0], kind="stable")].tobytes()
+    ).hexdigest()[:12]
+
+    existing = list(snapshot_dir.glob(f"*_{digest}.parquet"))
+    if existing:
+        return existing[0]
+
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_dir / f"{datetime.now():%Y%m%dT%H%M%S}_{digest}.parquet"
+    snapshot.to_parquet(path, index=False)
+    return path
+
+
+def list_snapshots(snapshot_dir: Path = SNAPSHOT_DIR) -> list[Path]:
+    """Snapshots oldest first"""
+    return sorted(snapshot_dir.glob("*.parquet"))
+
+
+def diff_snapshots(old_path: Path, new_path: Path) -> pd.DataFrame:
+    """Per-video changes between two snapshots.
+
+    Rows are `added`, `removed` or `changed`; unchanged videos are left out.
+    Metric columns hold new - old, a missing side counting as 0: added rows
+    hold their new values, removed rows their old values negated.
+    """
+    hash_cols = ["key_hash", "row_hash"]
+    old_hashes = pd.read_parquet(old_path, columns=hash_cols)
+    new_hashes = pd.read_parquet(new_path, columns=hash_cols)
+
+    # Join on the integer key hash, much cheaper than on the id strings
+    joined = old_hashes.merge(
+        new_hashes,
+        on="key_hash",
+        how="outer",
+        sort=False,
+        suffixes=("_old", "_new"),
+        indicator=True,
+    )
+    status = pd.Series(
+        np.select(
+            [
+                joined["_merge"] == "right_only",
+                joined["_merge"] == "left_only",
+                joined["row_hash_old"] != joined["row_hash_new"],
+            ],
+            ["added", "removed", "changed"],
+            default="",
+        ),
+        index=joined["key_hash"],
+    )
+    status = status[status != ""]
+    if status.empty:
+        return pd.DataFrame(columns=["Status", KEY_COL, *INFO_COLS, *DIFF_METRICS])
+
+    # Only the touched rows' values are read, filtered inside the parquet reader
+    value_cols = ["key_hash", KEY_COL, *INFO_COLS, *DIFF_METRICS]
+    changed = status.index.to_numpy()
+    old, new = (
+        pd.read_parquet(path, columns=value_cols, filters=[("key_hash", "in", changed)])
+        .set_index("key_hash")
+        .reindex(status.index)
+        for path in (old_path, new_path)
+    )
+
+    deltas = new[DIFF_METRICS].fillna(0) - old[DIFF_METRICS].fillna(0)
+    info = new[[KEY_COL, *INFO_COLS]].combine_first(old[[KEY_COL, *INFO_COLS]])
+    return pd.concat([status.rename("Status"), info, deltas], axis=1).reset_index(
+        drop=True
+    )
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from comment_dedup import flag_duplicate_comments
+
+SPAM = "Check out my channel for free data science courses and career coaching!"
+
+
+def flag(tmp_path, rows: list[tuple[str, str, str]]) -> pd.Series:
+    path = tmp_path / "comments.csv"
+    pd.DataFrame(rows, columns=["Comments", "user_ID", "VidId"]).to_csv(
+        path, index=False
+    )
+    return flag_duplicate_comments(path, max_workers=1)["Is_Spam"]
+
+
+def test_short_common_replies_are_not_flagged(tmp_path):
+    phrases = ["I like it!", "Thanks Ken!", "Thank you!", "Great video!"]
+    rows = [
+        (phrase, f"user_{i}_{j}", f"video_{j % 3}")
+        for i, phrase in enumerate(phrases)
+        for j in range(11)
+    ]
+    assert not flag(tmp_path, rows).any()
+
+
+def test_same_text_from_different_people_on_one_video_is_not_flagged(tmp_path):
+    text = "Thank you Ken, this was incredibly helpful for my job search!"
+    assert not flag(tmp_path, [(text, f"user_{i}", "video_0") for i in range(3)]).any()
+
+
+def test_copies_across_videos_are_flagged(tmp_path):
+    rows = [(SPAM, "user_0", f"video_{i}") for i in range(4)]
+    rows.append(("I like it!", "user_1", "video_0"))
+    assert flag(tmp_path, rows).tolist() == [False, True, True, True, False]
+
+
+def test_process_pool_matches_serial(tmp_path):
+    rows = [(SPAM, "user_0", f"video_{i}") for i in range(4)]
+    rows += [("I like it!", f"user_{i}", "video_0") for i in range(3)]
+    path = tmp_path / "comments.csv"
+    pd.DataFrame(rows, columns=["Comments", "user_ID", "VidId"]).to_csv(
+        path, index=False
+    )
+    serial = flag_duplicate_comments(path, chunksize=2)
+    pooled = flag_duplicate_comments(path, chunksize=2, max_workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
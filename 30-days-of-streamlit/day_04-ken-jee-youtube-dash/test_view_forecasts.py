@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from view_forecasts import fit_early_view_forecasts
+
+
+def daily_views(video: str, days: range, scale: float = 100.0) -> pd.DataFrame:
+    """Daily views whose cumulative sum is exactly scale * (day + 1) ** 0.5"""
+    cum = scale * np.sqrt(np.arange(days.stop) + 1.0)
+    views = np.diff(cum, prepend=0.0)
+    return pd.DataFrame(
+        {
+            "External Video ID": video,
+            "days_published": list(days),
+            "Views": views[days.start :],
+        }
+    )
+
+
+def test_power_law_is_recovered():
+    forecasts = fit_early_view_forecasts(daily_views("full", range(0, 8)))
+    forecast = forecasts.loc["full"]
+    assert forecast["first_day"] == 0
+    assert np.isclose(forecast["slope"], 0.5)
+    assert np.isclose(forecast["proj_30d_views"], 100 * np.sqrt(31))
+
+
+def test_late_starting_video_is_not_fitted():
+    df = pd.concat([daily_views("full", range(0, 8)), daily_views("late", range(3, 8))])
+    forecasts = fit_early_view_forecasts(df)
+    assert forecasts.loc["late", "first_day"] == 3
+    assert forecasts.loc["late", ["slope", "proj_30d_views"]].isna().all()
+    assert forecasts.loc["full"].notna().all()
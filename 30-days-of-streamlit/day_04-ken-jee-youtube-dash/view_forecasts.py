@@ -0,0 +1,75 @@
+"""
+Early-view forecasts: cumulative views of every video projected from its
+first days of daily views.
+
+Only videos whose daily rows start on the publish day (day 0) are fitted.
+Views before a video's first row are missing from the export, so a curve
+fitted from a later start would sit too low.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def fit_early_view_forecasts(
+    df_time_diff: pd.DataFrame,
+    fit_days: int = 7,
+    horizons: tuple[int, ...] = (30, 90),
+    min_points: int = 3,
+) -> pd.DataFrame:
+    """Forecast cumulative views for every video from its first `fit_days` days.
+
+    Fits log(cum_views) = a + b * log(day + 1) for all videos at once with the
+    closed-form least-squares solution, so there is no per-video model fit.
+    `first_day` is a video's first day with data; the fit and projections are
+    NaN when it is not 0.
+    """
+    daily = (
+        df_time_diff[lambda x: x["days_published"].between(0, fit_days)]
+        .pivot_table(
+            index="External Video ID",
+            columns="days_published",
+            values="Views",
+            aggfunc="sum",
+        )
+        .reindex(columns=range(fit_days + 1))
+    )
+    has_data = daily.notna().to_numpy()
+    first_day = has_data.argmax(axis=1)
+    cum = daily.fillna(0).cumsum(axis=1).to_numpy(dtype=float)
+    mask = has_data & (cum > 0)
+
+    # Masked normal equations, one row per video
+    x = np.log(np.arange(fit_days + 1) + 1.0)
+    y = np.log(np.where(mask, cum, 1.0))
+    w = mask.astype(float)
+    s0 = w.sum(axis=1)
+    sx = w @ x
+    sxx = w @ (x * x)
+    sy = (w * y).sum(axis=1)
+    sxy = (w * y) @ x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (s0 * sxy - sx * sy) / (s0 * sxx - sx**2)
+        intercept = (sy - slope * sx) / s0
+    ok = (s0 >= min_points) & (first_day == 0)
+    slope = np.where(ok, slope, np.nan)
+    intercept = np.where(ok, intercept, np.nan)
+
+    return pd.DataFrame(
+        {
+            "first_day": first_day,
+            "intercept": intercept,
+            "slope": slope,
+            **{
+                f"proj_{h}d_views": np.exp(intercept + slope * np.log(h + 1.0))
+                for h in horizons
+            },
+        },
+        index=daily.index,
+    )
+
+
+def project_cumulative_views(forecast: pd.Series, days: np.ndarray) -> np.ndarray:
+    """Evaluate one video's fitted curve at `days`"""
+    return np.exp(forecast["intercept"] + forecast["slope"] * np.log(days + 1.0))
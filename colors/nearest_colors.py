@@ -0,0 +1,158 @@
+"""
+Nearest named colours and palette entries to a colour, by CIEDE2000.
+
+Every CSS4 and XKCD colour and every entry of the palettes in the catalog
+goes into one CIELAB array, so a query is a single vectorized ΔE2000
+against all of them. A palette only returns its closest entry: neighbouring
+steps of a sampled colormap would otherwise fill the top k.
+"""
+
+import functools
+from dataclasses import dataclass
+
+import matplotlib.colors as mcolors
+import numpy as np
+
+from palette_catalog import catalog, make_palette, rgb_to_lab
+
+DEFAULT_K = 10
+
+
+@dataclass(frozen=True, eq=False)
+class ColorIndex:
+    lab: np.ndarray
+    hex: tuple[str, ...]
+    names: tuple[str, ...]
+    sources: tuple[str, ...]
+    # Offset of each palette's first entry; a named colour is a palette of one
+    starts: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.hex)
+
+
+@dataclass
+class ColorMatch:
+    name: str
+    source: str
+    hex: str
+    delta_e: float
+
+    def as_row(self) -> dict:
+        return {
+            "Name": self.name,
+            "Source": self.source,
+            "Hex": self.hex,
+            "ΔE2000": round(self.delta_e, 2),
+        }
+
+
+def delta_e_2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+    """CIEDE2000 colour difference, broadcast over the last axis"""
+    L1, a1, b1 = np.moveaxis(np.asarray(lab1, dtype=float), -1, 0)
+    L2, a2, b2 = np.moveaxis(np.asarray(lab2, dtype=float), -1, 0)
+
+    c_mean7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_mean7 / (c_mean7 + 25.0**7)))
+    a1, a2 = (1 + g) * a1, (1 + g) * a2
+    c1, c2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360
+    h2 = np.degrees(np.arctan2(b2, a2)) % 360
+    chroma = c1 * c2 != 0
+
+    dh = h2 - h1
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chroma, dh, 0)
+    dL = L2 - L1
+    dC = c2 - c1
+    dH = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(dh / 2))
+
+    L_mean = (L1 + L2) / 2
+    c_mean = (c1 + c2) / 2
+    h_sum = h1 + h2
+    h_mean = np.where(
+        ~chroma,
+        h_sum,
+        np.where(
+            np.abs(h1 - h2) <= 180,
+            h_sum / 2,
+            np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2),
+        ),
+    )
+    t = (
+        1
+        - 0.17 * np.cos(np.radians(h_mean - 30))
+        + 0.24 * np.cos(np.radians(2 * h_mean))
+        + 0.32 * np.cos(np.radians(3 * h_mean + 6))
+        - 0.20 * np.cos(np.radians(4 * h_mean - 63))
+    )
+    rotation = 30 * np.exp(-(((h_mean - 275) / 25) ** 2))
+    c_mean7 = c_mean**7
+    r_t = -2 * np.sqrt(c_mean7 / (c_mean7 + 25.0**7)) * np.sin(np.radians(2 * rotation))
+    s_l = 1 + 0.015 * (L_mean - 50) ** 2 / np.sqrt(20 + (L_mean - 50) ** 2)
+    s_c = 1 + 0.045 * c_mean
+    s_h = 1 + 0.015 * c_mean * t
+
+    return np.sqrt(
+        (dL / s_l) ** 2
+        + (dC / s_c) ** 2
+        + (dH / s_h) ** 2
+        + r_t * (dC / s_c) * (dH / s_h)
+    )
+
+
+@functools.cache
+def color_index() -> ColorIndex:
+    palettes = []
+    for source, named in (
+        ("CSS4", mcolors.CSS4_COLORS),
+        ("XKCD", mcolors.XKCD_COLORS),
+    ):
+        for name, color in named.items():
+            palette = make_palette(name.removeprefix("xkcd:"), [mcolors.to_rgb(color)])
+            palettes.append((source, palette, False))
+    groups = vars(catalog())
+    for group, members in groups.items():
+        source = group.replace("_", " ").capitalize()
+        for name, palette in members.items():
+            # Reversed Plotly palettes hold the same colours
+            if not name.endswith("_r"):
+                palettes.append((source, palette, True))
+
+    names, sources, hexes = [], [], []
+    for source, palette, indexed in palettes:
+        names += (
+            [f"{palette.name} [{i}]" for i in range(len(palette))]
+            if indexed
+            else [palette.name]
+        )
+        sources += [source] * len(palette)
+        hexes += palette.hex
+    return ColorIndex(
+        np.concatenate([palette.lab for _, palette, _ in palettes]),
+        tuple(hexes),
+        tuple(names),
+        tuple(sources),
+        np.cumsum([0] + [len(palette) for _, palette, _ in palettes[:-1]]),
+    )
+
+
+def nearest_colors(color: str, k: int = DEFAULT_K) -> list[ColorMatch]:
+    """The `k` closest colours to `color`, at most one per palette"""
+    index = color_index()
+    distances = delta_e_2000(rgb_to_lab(mcolors.to_rgb(color)), index.lab)
+    closest = np.minimum.reduceat(distances, index.starts)
+    k = min(k, len(closest))
+    groups = np.argpartition(closest, k - 1)[:k]
+    groups = groups[np.argsort(closest[groups], kind="stable")]
+    ends = np.append(index.starts[1:], len(index))
+    matches = []
+    for group in groups.tolist():
+        start = index.starts[group]
+        i = start + int(np.argmin(distances[start : ends[group]]))
+        matches.append(
+            ColorMatch(
+                index.names[i], index.sources[i], index.hex[i], float(distances[i])
+            )
+        )
+    return matches
@@ -0,0 +1,137 @@
+"""
+Every matplotlib colormap and Plotly palette, converted once per process.
+
+Palettes keep their name, hex strings and (n, 3) RGB and CIELAB float
+arrays. Qualitative matplotlib colormaps keep their listed colours, the
+others are sampled into a 256-step LUT. Plotly palettes mix "#rrggbb" and
+"rgb(r, g, b)" strings; here they are all hex.
+"""
+
+import functools
+from dataclasses import dataclass
+from types import ModuleType
+
+import matplotlib as mpl
+import matplotlib.colors as mcolors
+import numpy as np
+from matplotlib.colors import ListedColormap
+from plotly import express as px
+
+LUT_SIZE = 256
+
+# sRGB (D65) to CIE XYZ, and the D65 white point
+SRGB_TO_XYZ = np.array(
+    [
+        [0.4124564, 0.3575761, 0.1804375],
+        [0.2126729, 0.7151522, 0.0721750],
+        [0.0193339, 0.1191920, 0.9503041],
+    ]
+)
+WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+
+
+@dataclass(frozen=True, eq=False)
+class Palette:
+    name: str
+    hex: tuple[str, ...]
+    rgb: np.ndarray
+    lab: np.ndarray
+    # Sampled from a continuous colormap rather than a list of colours
+    continuous: bool = False
+
+    def __len__(self) -> int:
+        return len(self.hex)
+
+    def lut(self, size: int = LUT_SIZE) -> np.ndarray:
+        """(size, 3) RGB, the palette stretched over `size` even steps"""
+        if len(self) == size:
+            return self.rgb
+        return self.rgb[np.arange(size) * len(self) // size]
+
+    def sample(self, n_colors: int) -> list[str]:
+        """`n_colors` hex strings spread evenly over the palette"""
+        if len(self) <= n_colors:
+            return list(self.hex)
+        indices = np.linspace(0, len(self) - 1, n_colors).round().astype(int)
+        return [self.hex[i] for i in indices]
+
+
+@dataclass(frozen=True)
+class PaletteCatalog:
+    matplotlib: dict[str, Palette]
+    plotly_qualitative: dict[str, Palette]
+    plotly_sequential: dict[str, Palette]
+    plotly_diverging: dict[str, Palette]
+    plotly_cyclical: dict[str, Palette]
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """CIELAB (D65) of sRGB colours in [0, 1], over the last axis"""
+    rgb = np.asarray(rgb, dtype=float)
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ SRGB_TO_XYZ.T / WHITE_D65
+    delta = 6 / 29
+    f = np.where(xyz > delta**3, np.cbrt(xyz), xyz / (3 * delta**2) + 4 / 29)
+    return np.stack(
+        [
+            116 * f[..., 1] - 16,
+            500 * (f[..., 0] - f[..., 1]),
+            200 * (f[..., 1] - f[..., 2]),
+        ],
+        axis=-1,
+    )
+
+
+def rgb_to_hex(rgb: np.ndarray) -> tuple[str, ...]:
+    values = np.rint(np.clip(rgb, 0, 1) * 255).astype(np.uint32)
+    packed = (values[:, 0] << 16) | (values[:, 1] << 8) | values[:, 2]
+    return tuple(f"#{v:06x}" for v in packed.tolist())
+
+
+def _parse(color: str) -> tuple[float, ...]:
+    if color.startswith("rgb"):
+        return tuple(
+            float(v) / 255 for v in color[color.index("(") + 1 : -1].split(",")[:3]
+        )
+    return mcolors.to_rgb(color)
+
+
+def make_palette(name: str, rgb: np.ndarray, continuous: bool = False) -> Palette:
+    rgb = np.asarray(rgb, dtype=float)[:, :3]
+    return Palette(name, rgb_to_hex(rgb), rgb, rgb_to_lab(rgb), continuous)
+
+
+def _matplotlib_palettes() -> dict[str, Palette]:
+    palettes = {}
+    for name in sorted(mpl.colormaps, key=str.lower):
+        # Reversed colormaps are the same colours
+        if name.endswith("_r"):
+            continue
+        cmap = mpl.colormaps[name]
+        if isinstance(cmap, ListedColormap) and cmap.N < LUT_SIZE:
+            palettes[name] = make_palette(name, np.asarray(cmap.colors))
+        else:
+            palettes[name] = make_palette(
+                name, cmap(np.linspace(0, 1, LUT_SIZE)), continuous=True
+            )
+    return palettes
+
+
+def _plotly_palettes(module: ModuleType) -> dict[str, Palette]:
+    return {
+        name: make_palette(name, np.array([_parse(c) for c in colors]))
+        for name in dir(module)
+        if not name.startswith("_")
+        and isinstance(colors := getattr(module, name), list)
+    }
+
+
+@functools.cache
+def catalog() -> PaletteCatalog:
+    return PaletteCatalog(
+        matplotlib=_matplotlib_palettes(),
+        plotly_qualitative=_plotly_palettes(px.colors.qualitative),
+        plotly_sequential=_plotly_palettes(px.colors.sequential),
+        plotly_diverging=_plotly_palettes(px.colors.diverging),
+        plotly_cyclical=_plotly_palettes(px.colors.cyclical),
+    )
@@ -16,15 +16,19 @@ To run:
 > streamlit run color_swatch_app.py
 """
 
-import matplotlib as mpl
+from io import BytesIO
+from time import perf_counter
+
 import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
-from matplotlib import cm
-from plotly import express as px
+from matplotlib import font_manager
+from PIL import Image, ImageDraw, ImageFont
+
+from nearest_colors import DEFAULT_K, color_index, nearest_colors
+from palette_catalog import catalog
 
 # ---------- Function definitions
 
@@ -46,58 +50,72 @@ matplotlib_categorical_maps = [
 
 
 def get_mpl_colors(name, n_colors=12):
-    cmap = cm.get_cmap(name)
-    if hasattr(cmap, "colors"):
-        # Use the actual color list for categorical colormaps
-        colors = cmap.colors
-    else:
-        # Fallback for continuous colormaps
-        colors = [cmap(i / (n_colors - 1)) for i in range(n_colors)]
-
-    return [mcolors.to_hex(c) for c in colors[:n_colors]]
-
-
-# From the maptplotlib documentation
-# https://matplotlib.org/stable/users/explain/colors/colormaps.html
-cmaps = {}
-gradient = np.linspace(0, 1, 256)
-gradient = np.vstack((gradient, gradient))
-
-
-def plot_color_gradients(category, cmap_list):
-    # Create figure and adjust figure height to number of colormaps
-    nrows = len(cmap_list)
-    figh = 0.35 + 0.15 + (nrows + (nrows - 1) * 0.1) * 0.22
-    fig, axs = plt.subplots(nrows=nrows + 1, figsize=(6.4, figh))
-    fig.subplots_adjust(top=1 - 0.35 / figh, bottom=0.15 / figh, left=0.2, right=0.99)
-    axs[0].set_title(f"{category} colormaps", fontsize=14)
-
-    for ax, name in zip(axs, cmap_list):
-        ax.imshow(gradient, aspect="auto", cmap=mpl.colormaps[name])
-        ax.text(
-            -0.01,
-            0.5,
+    palette = catalog().matplotlib[name]
+    if palette.continuous:
+        return palette.sample(n_colors)
+    # Use the actual color list for categorical colormaps
+    return list(palette.hex[:n_colors])
+
+
+# Layout of the gradient strips, in pixels
+STRIP_WIDTH = 512
+STRIP_HEIGHT = 22
+STRIP_GAP = 4
+LABEL_WIDTH = 128
+TITLE_HEIGHT = 36
+
+
+@st.cache_data
+def gradient_strips(category, cmap_list):
+    """PNG of one labelled gradient strip per colormap"""
+    # Every colormap's 256-step LUT, stretched to the strip width
+    columns = np.arange(STRIP_WIDTH) * 256 // STRIP_WIDTH
+    luts = np.stack([catalog().matplotlib[name].lut()[columns] for name in cmap_list])
+
+    pitch = STRIP_HEIGHT + STRIP_GAP
+    height = TITLE_HEIGHT + len(cmap_list) * pitch
+    canvas = np.full((height, LABEL_WIDTH + STRIP_WIDTH, 3), 255, dtype=np.uint8)
+    rows = canvas[TITLE_HEIGHT:, LABEL_WIDTH:].reshape(
+        len(cmap_list), pitch, STRIP_WIDTH, 3
+    )
+    rows[:, :STRIP_HEIGHT] = np.rint(luts * 255).astype(np.uint8)[:, None]
+
+    image = Image.fromarray(canvas)
+    draw = ImageDraw.Draw(image)
+    font_path = font_manager.findfont("DejaVu Sans")
+    title_font = ImageFont.truetype(font_path, 18)
+    label_font = ImageFont.truetype(font_path, 13)
+    draw.text(
+        (LABEL_WIDTH + STRIP_WIDTH // 2, TITLE_HEIGHT // 2),
+        f"{category} colormaps",
+        fill="black",
+        font=title_font,
+        anchor="mm",
+    )
+    for i, name in enumerate(cmap_list):
+        draw.text(
+            (LABEL_WIDTH - 8, TITLE_HEIGHT + i * pitch + STRIP_HEIGHT // 2),
             name,
-            va="center",
-            ha="right",
-            fontsize=10,
-            transform=ax.transAxes,
+            fill="black",
+            font=label_font,
+            anchor="rm",
         )
+    buffer = BytesIO()
+    image.save(buffer, format="png")
+    return buffer.getvalue()
 
-    # Turn off *all* ticks & spines, not just the ones with colormaps.
-    for ax in axs:
-        ax.set_axis_off()
 
-    # Save colormap list for later.
-    cmaps[category] = cmap_list
+def show_color_gradients(category, cmap_list):
+    """Show the gradients of a category as one cached image"""
+    # From the maptplotlib documentation
     st.markdown("https://matplotlib.org/stable/users/explain/colors/colormaps.html")
-    return fig
+    st.image(gradient_strips(category, tuple(cmap_list)))
 
 
 def show_mpl_qualitative():
     """Show the mpl qualitative colormaps"""
     st.header("Matplotlib - Qualitative Palettes")
-    fig = plot_color_gradients(
+    show_color_gradients(
         "Qualitative",
         [
             "Pastel1",
@@ -114,7 +132,6 @@ def show_mpl_qualitative():
             "tab20c",
         ],
     )
-    st.pyplot(fig)
 
 
 def show_mpl_plotly_qualitative():
@@ -218,17 +235,16 @@ def show_mpl_plotly_1_line_qualitative():
 def show_mpl_perceptually_uniform_sequential():
     """Show the mpl perceptually uniform sequential colormaps"""
     st.header("Matplotlib - Perceptually Uniform Sequential Colormaps")
-    fig = plot_color_gradients(
+    show_color_gradients(
         "Perceptually Uniform Sequential",
         ["viridis", "plasma", "inferno", "magma", "cividis"],
     )
-    st.pyplot(fig)
 
 
 def show_mpl_sequential():
     """Show the mpl sequential colormaps"""
     st.header("Matplotlib - Sequential Colormaps")
-    fig = plot_color_gradients(
+    show_color_gradients(
         "Sequential",
         [
             "Greys",
@@ -251,13 +267,12 @@ def show_mpl_sequential():
             "YlGn",
         ],
     )
-    st.pyplot(fig)
 
 
 def show_mpl_sequential_2():
     """Show the mpl perceptually uniform sequential colormaps"""
     st.header("Matplotlib - Sequential (2) Colormaps")
-    fig = plot_color_gradients(
+    show_color_gradients(
         "Sequential (2)",
         [
             "binary",
@@ -278,13 +293,12 @@ def show_mpl_sequential_2():
             "copper",
         ],
     )
-    st.pyplot(fig)
 
 
 def show_mpl_diverging():
     """Show the mpl diverging colormaps"""
     st.header("Matplotlib - Diverging Colormaps")
-    fig = plot_color_gradients(
+    show_color_gradients(
         "Diverging",
         [
             "PiYG",
@@ -304,20 +318,18 @@ def show_mpl_diverging():
             "vanimo",
         ],
     )
-    st.pyplot(fig)
 
 
 def show_mpl_cyclic():
     """Show the mpl diverging colormaps"""
     st.header("Matplotlib - Cyclic Colormaps")
-    fig = plot_color_gradients("Cyclic", ["twilight", "twilight_shifted", "hsv"])
-    st.pyplot(fig)
+    show_color_gradients("Cyclic", ["twilight", "twilight_shifted", "hsv"])
 
 
 def show_mpl_miscellaneous():
     """Show the mpl miscellaneous colormaps"""
     st.header("Matplotlib - Miscellaneous Colormaps")
-    fig = plot_color_gradients(
+    show_color_gradients(
         "Miscellaneous",
         [
             "flag",
@@ -339,7 +351,6 @@ def show_mpl_miscellaneous():
             "gist_ncar",
         ],
     )
-    st.pyplot(fig)
 
 
 def show_mpl_css4_colors_with_filter():
@@ -368,6 +379,35 @@ def show_mpl_css4_colors_with_filter():
         )
 
 
+def show_nearest_colors():
+    """Find the named colours and palette entries closest to a colour"""
+    st.header("Nearest Colours (ΔE2000)")
+
+    left, right = st.columns([1, 3])
+    picked = left.color_picker("Colour", "#3a7bd5")
+    typed = left.text_input("or a hex code / colour name:", "")
+    k = left.slider("Matches", 1, 50, DEFAULT_K)
+    color = typed.strip() or picked
+    if not mcolors.is_color_like(color):
+        right.error(f"Not a colour: {color}")
+        return
+
+    t0 = perf_counter()
+    matches = nearest_colors(color, k)
+    elapsed = perf_counter() - t0
+    right.caption(
+        f"{mcolors.to_hex(color)}: {len(color_index())} colours from CSS4, XKCD "
+        f"and every palette searched in {elapsed * 1000:.1f} ms, "
+        "closest entry per palette"
+    )
+    right.dataframe(
+        pd.DataFrame([m.as_row() for m in matches]).style.map(
+            lambda c: f"background-color: {c}; color: white", subset=["Hex"]
+        ),
+        hide_index=True,
+    )
+
+
 # --- Plotly ---
 
 
@@ -406,16 +446,9 @@ def show_plotly_qual_swatches():
     # --- Plotly Qualitative Palettes ---
     st.header("Plotly - Qualitative Palettes")
 
-    palette_names = [
-        name
-        for name in dir(px.colors.qualitative)
-        if not name.startswith("_")
-        and isinstance(getattr(px.colors.qualitative, name), list)
-    ]
-
-    selected_palette = st.selectbox("Choose a palette", palette_names)
-    plotly_colors = getattr(px.colors.qualitative, selected_palette)
-    # plotly_colors = px.colors.qualitative.__dict__[selected_palette]
+    palettes = catalog().plotly_qualitative
+    selected_palette = st.selectbox("Choose a palette", list(palettes))
+    plotly_colors = list(palettes[selected_palette].hex)
     plotly_df = pd.DataFrame(
         {"Index": list(range(len(plotly_colors))), "Color": plotly_colors}
     )
@@ -440,16 +473,9 @@ def show_plotly_sequential_color_scales():
     # --- Sequential Scales as Gradient Bars ---
     st.header("Plotly - Sequential Color Scales")
 
-    seq_names = [
-        name
-        for name in dir(px.colors.sequential)
-        if not name.startswith("_")
-        and isinstance(getattr(px.colors.sequential, name), list)
-    ]
-    cont_palette = st.selectbox("Choose a sequential scale", seq_names)
-
-    # gradient_colors = px.colors.sequential.__dict__[cont_palette]
-    gradient_colors = getattr(px.colors.sequential, cont_palette)
+    palettes = catalog().plotly_sequential
+    cont_palette = st.selectbox("Choose a sequential scale", list(palettes))
+    gradient_colors = list(palettes[cont_palette].hex)
     n_colors = len(gradient_colors)
 
     st.write(f"Gradient scale: {cont_palette} ({n_colors} colors)")
@@ -468,17 +494,9 @@ def show_plotly_diverging_gradient_scales():
 
     # --- Diverging Scales as Gradient Bars ---
     st.header("Plotly - Diverging Color Scales")
-    div_names = [
-        name
-        for name in dir(px.colors.diverging)
-        if not name.startswith("_")
-        and isinstance(getattr(px.colors.diverging, name), list)
-    ]
-
-    div_palette = st.selectbox("Choose a diverging scale", div_names)
-
-    # div_colors = px.colors.diverging.__dict__[div_palette]
-    div_colors = getattr(px.colors.diverging, div_palette)
+    palettes = catalog().plotly_diverging
+    div_palette = st.selectbox("Choose a diverging scale", list(palettes))
+    div_colors = list(palettes[div_palette].hex)
     n_colors = len(div_colors)
 
     st.write(f"Diverging scale: {div_palette} ({n_colors} colors)")
@@ -494,19 +512,13 @@ def show_plotly_diverging_gradient_scales():
 
 def plot_all_qualitative_palettes():
     fig = go.Figure()
-    palette_names = [
-        name
-        for name in dir(px.colors.qualitative)
-        if not name.startswith("_")
-        and isinstance(getattr(px.colors.qualitative, name), list)
-    ]
+    palettes = catalog().plotly_qualitative
 
     cell_size = 20
     padding = 10
 
-    for row, name in enumerate(palette_names):
-        colors = getattr(px.colors.qualitative, name)
-        for col, color in enumerate(colors):
+    for row, (name, palette) in enumerate(palettes.items()):
+        for col, color in enumerate(palette.hex):
             fig.add_shape(
                 type="rect",
                 x0=col * cell_size,
@@ -527,11 +539,8 @@ def plot_all_qualitative_palettes():
             font=dict(size=12),
         )
 
-    width = (
-        max(len(getattr(px.colors.qualitative, name)) for name in palette_names)
-        * cell_size
-    )
-    height = len(palette_names) * (cell_size + padding)
+    width = max(len(palette) for palette in palettes.values()) * cell_size
+    height = len(palettes) * (cell_size + padding)
 
     fig.update_xaxes(visible=False)
     fig.update_yaxes(visible=False)
@@ -551,6 +560,9 @@ def main():
     st.set_page_config(layout="wide")
     st.title("🎨 Color Swatches Explorer")
     st.sidebar.title("🧭 Display Options")
+    # Built once per process, on the first run
+    catalog()
+    color_index()
 
     # Map of choice name to show, to function to run
     choice_map = {
@@ -558,6 +570,7 @@ def main():
         "Matplotlib (Plotly) - Qualitative Palettes": show_mpl_plotly_qualitative,
         "Matplotlib (Plotly 1 line)- Qualitative Palettes": show_mpl_plotly_1_line_qualitative,
         "Matplotlib - CSS4 Colors (filter)": show_mpl_css4_colors_with_filter,
+        "Nearest Colours (ΔE2000)": show_nearest_colors,
         "Matplotlib - Perceptually Uniform Sequential Colormaps": show_mpl_perceptually_uniform_sequential,
         "Matplotlib - Sequential Palettes": show_mpl_sequential,
         "Matplotlib - Sequential (2) Colormaps": show_mpl_sequential_2,
@@ -0,0 +1,186 @@
+"""
+Shortest paths for many start/end pairs on one maze.
+
+Pairs are grouped by source and every unique source gets one BFS distance
+field, from which all of its path lengths are read off at once. If there are
+fewer unique ends than starts, the fields are computed from the ends instead
+(the maze is undirected). Paths of all queries of a source are walked back
+down its distance field together, and returned as flat cell indices with
+per-query offsets.
+
+To run:
+> python batch_queries.py --size 201 --rooms 3 --pairs 10000 --paths
+"""
+
+import argparse
+from dataclasses import dataclass
+from time import perf_counter
+
+import numpy as np
+
+from landmarks import bfs_distances
+from utils import MazePath, generate_maze, maze_to_grid
+
+MIN_VECTORIZED_WALKS = 16
+
+
+@dataclass
+class BatchResult:
+    # Steps per query, -1 if the end is unreachable
+    lengths: np.ndarray
+    # Flat (row * width + col) cells of every path, concatenated, and the
+    # start of query i's path at offsets[i] (None unless paths were asked for)
+    cells: np.ndarray | None
+    offsets: np.ndarray | None
+    width: int
+    elapsed_s: float
+
+    @property
+    def queries_per_second(self) -> float:
+        return len(self.lengths) / self.elapsed_s if self.elapsed_s else float("inf")
+
+    def path(self, i: int) -> MazePath:
+        cells = self.cells[self.offsets[i] : self.offsets[i + 1]]
+        return list(zip(*(c.tolist() for c in np.divmod(cells, self.width))))
+
+
+def _parents(field: np.ndarray, width: int) -> np.ndarray:
+    """Flat index of a neighbor one step closer to the source, per cell"""
+    cells = np.arange(field.size)
+    parents = cells.copy()
+    for offset in (-width, width, -1, 1):
+        neighbors = np.clip(cells + offset, 0, field.size - 1)
+        closer = (field > 0) & (field[neighbors] == field - 1)
+        parents[closer] = neighbors[closer]
+    return parents
+
+
+def _walk_paths(
+    parents: np.ndarray, targets: np.ndarray, lengths: np.ndarray, reverse: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Paths to `targets` as one flat block and offsets into it.
+
+    All walks advance one step per iteration, longest first, so the loop
+    runs max(lengths) times over shrinking numpy slices. That only pays off
+    for enough walks at once; fewer are followed cell by cell.
+    """
+    sizes = np.where(lengths >= 0, lengths + 1, 0)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    if len(targets) < MIN_VECTORIZED_WALKS:
+        parent = parents.tolist()
+        walks = []
+        for cell, size in zip(targets.tolist(), sizes.tolist()):
+            if not size:
+                continue
+            walk = [cell]
+            for _ in range(size - 1):
+                cell = parent[cell]
+                walk.append(cell)
+            walks.append(walk if reverse else walk[::-1])
+        block = np.fromiter(
+            (cell for walk in walks for cell in walk), np.int32, offsets[-1]
+        )
+        return block, offsets
+
+    block = np.empty(offsets[-1], dtype=np.int32)
+    order = np.argsort(-sizes, kind="stable")
+    cursor = targets[order]
+    # Walks start at the target: the first or the last cell of the path
+    position = offsets[order] if reverse else offsets[order] + sizes[order] - 1
+    step = 1 if reverse else -1
+    active = len(order)
+    for t in range(int(sizes.max(initial=0))):
+        while active and sizes[order[active - 1]] <= t:
+            active -= 1
+        block[position[:active] + step * t] = cursor[:active]
+        cursor[:active] = parents[cursor[:active]]
+    return block, offsets
+
+
+def batch_shortest_paths(
+    grid: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    return_paths: bool = False,
+) -> BatchResult:
+    """Shortest path length (and optionally path) for each (starts[i], ends[i])"""
+    t0 = perf_counter()
+    grid = np.asarray(grid, dtype=np.uint8)
+    width = grid.shape[1]
+    starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+    start_cells = starts[:, 0] * width + starts[:, 1]
+    end_cells = ends[:, 0] * width + ends[:, 1]
+
+    reverse = len(np.unique(end_cells)) < len(np.unique(start_cells))
+    sources, targets = (end_cells, start_cells) if reverse else (start_cells, end_cells)
+    unique_sources, inverse = np.unique(sources, return_inverse=True)
+    by_source = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[by_source], np.arange(len(unique_sources) + 1))
+
+    lengths = np.empty(len(sources), dtype=np.int32)
+    blocks = []
+    for k, source in enumerate(unique_sources.tolist()):
+        queries = by_source[bounds[k] : bounds[k + 1]]
+        field = bfs_distances(grid, divmod(source, width)).ravel()
+        lengths[queries] = field[targets[queries]]
+        if return_paths:
+            blocks.append(
+                (
+                    queries,
+                    *_walk_paths(
+                        _parents(field, width),
+                        targets[queries],
+                        lengths[queries],
+                        reverse,
+                    ),
+                )
+            )
+
+    cells = offsets = None
+    if return_paths:
+        sizes = np.where(lengths >= 0, lengths + 1, 0)
+        offsets = np.concatenate([[0], np.cumsum(sizes)])
+        cells = np.empty(offsets[-1], dtype=np.int32)
+        for queries, block, block_offsets in blocks:
+            # Shift each query's run of the block to its place in `cells`
+            shift = offsets[queries] - block_offsets[:-1]
+            cells[np.arange(block.size) + np.repeat(shift, sizes[queries])] = block
+    return BatchResult(lengths, cells, offsets, width, perf_counter() - t0)
+
+
+def random_pairs(
+    grid: np.ndarray, num_pairs: int, num_sources: int | None = None, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Random open-cell (start, end) pairs, starts drawn from `num_sources` cells"""
+    rng = np.random.default_rng(seed)
+    open_cells = np.argwhere(np.asarray(grid) == 0)
+    sources = open_cells[rng.choice(len(open_cells), num_sources or num_pairs)]
+    starts = sources[rng.integers(len(sources), size=num_pairs)]
+    ends = open_cells[rng.integers(len(open_cells), size=num_pairs)]
+    return starts, ends
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=101)
+    parser.add_argument("--rooms", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pairs", type=int, default=1000)
+    parser.add_argument("--sources", type=int, help="unique starts (default: all)")
+    parser.add_argument("--paths", action="store_true", help="also return paths")
+    args = parser.parse_args()
+
+    maze = generate_maze(args.seed, args.size, args.size, args.rooms, (3, 6))
+    grid = maze_to_grid(maze)
+    starts, ends = random_pairs(grid, args.pairs, args.sources, args.seed)
+    result = batch_shortest_paths(grid, starts, ends, return_paths=args.paths)
+    print(
+        f"{len(result.lengths)} queries in {result.elapsed_s:.3f} s "
+        f"({result.queries_per_second:,.0f} queries/s), "
+        f"mean length {result.lengths[result.lengths >= 0].mean():.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Benchmark the pathfinding strategies over maze size x rooms x seed.
+
+Every run records wall time, peak traced memory, expanded nodes, path length
+and optimality (path length / BFS shortest length) and the results are
+written to CSV and/or JSON for `benchmark_app.py` to chart.
+
+To run:
+> python benchmark.py --sizes 11 101 501 2001 --seeds 5 --csv benchmark_results.csv
+"""
+
+import argparse
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from itertools import product
+from pathlib import Path
+
+import pandas as pd
+from py_wanderer import HEURISTICS
+
+from pathfinding import ALGORITHMS
+from solvers import run_strategy
+from utils import SolvingStrategy, generate_maze, shortest_path_length
+
+DEFAULT_SIZES = (11, 25, 51, 101, 201)
+DEFAULT_ROOMS = (0, 3)
+# Largest maze these are run on unless --no-size-limits: exponential / O(V^2)
+SIZE_LIMITS = {"IterativeDeepeningDFS": 25, "BellmanFord": 101}
+
+
+@dataclass
+class BenchmarkRecord:
+    size: int
+    num_rooms: int
+    seed: int
+    algorithm: str
+    heuristic: str
+    time_s: float | None = None
+    peak_memory_bytes: int | None = None
+    expanded_nodes: int | None = None
+    path_length: int | None = None
+    optimal_length: int | None = None
+    optimality: float | None = None
+    error: str | None = None
+
+
+def run_one(
+    maze, strategy: SolvingStrategy, optimal_length: int | None, trace_memory: bool
+) -> dict:
+    result = run_strategy(maze.maze, maze.start, maze.end, strategy)
+    record = {
+        "time_s": result.wall_time,
+        "expanded_nodes": result.expanded_nodes,
+        "path_length": result.path_length,
+        "optimality": (
+            result.path_length / optimal_length
+            if result.path_length is not None and optimal_length
+            else None
+        ),
+    }
+    if trace_memory:
+        # Separate traced run: tracemalloc slows the solve down too much to time
+        tracemalloc.start()
+        run_strategy(maze.maze, maze.start, maze.end, strategy)
+        record["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return record
+
+
+def run_benchmark(
+    sizes=DEFAULT_SIZES,
+    room_counts=DEFAULT_ROOMS,
+    seeds=range(3),
+    strategies: list[SolvingStrategy] | None = None,
+    room_size_range: tuple[int, int] = (3, 6),
+    trace_memory: bool = True,
+    size_limits: dict[str, int] = SIZE_LIMITS,
+    progress: Callable[[int, int], None] | None = None,
+) -> Iterator[BenchmarkRecord]:
+    """Yield one record per (size, rooms, seed, strategy) run"""
+    strategies = strategies or list(product(ALGORITHMS, HEURISTICS))
+    grid_points = list(product(sizes, room_counts, seeds))
+    total = len(grid_points) * len(strategies)
+    done = 0
+
+    for size, num_rooms, seed in grid_points:
+        maze = generate_maze(seed, size, size, num_rooms, room_size_range)
+        optimal_length = shortest_path_length(maze.maze, maze.start, maze.end)
+        for algorithm, heuristic in strategies:
+            record = BenchmarkRecord(
+                size,
+                num_rooms,
+                seed,
+                algorithm.__name__,
+                heuristic.__name__,
+                optimal_length=optimal_length,
+            )
+            if size > size_limits.get(algorithm.__name__, size):
+                record.error = "skipped: above size limit"
+            else:
+                try:
+                    for key, value in run_one(
+                        maze, (algorithm, heuristic), optimal_length, trace_memory
+                    ).items():
+                        setattr(record, key, value)
+                except (RecursionError, MemoryError) as e:
+                    record.error = type(e).__name__
+            done += 1
+            if progress:
+                progress(done, total)
+            yield record
+
+
+def to_frame(records) -> pd.DataFrame:
+    return pd.DataFrame([asdict(r) for r in records]).convert_dtypes()
+
+
+def by_name(options, names):
+    if not names:
+        return list(options)
+    lookup = {option.__name__.lower(): option for option in options}
+    return [lookup[name.lower()] for name in names]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--rooms", type=int, nargs="+", default=DEFAULT_ROOMS)
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeds")
+    parser.add_argument("--algorithms", nargs="*", help="default: all")
+    parser.add_argument("--heuristics", nargs="*", help="default: all")
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--no-size-limits", action="store_true")
+    parser.add_argument("--csv", type=Path)
+    parser.add_argument("--json", type=Path)
+    args = parser.parse_args()
+
+    strategies = list(
+        product(
+            by_name(ALGORITHMS, args.algorithms),
+            by_name(HEURISTICS, args.heuristics),
+        )
+    )
+    records = run_benchmark(
+        sizes=args.sizes,
+        room_counts=args.rooms,
+        seeds=range(args.seeds),
+        strategies=strategies,
+        trace_memory=not args.no_memory,
+        size_limits={} if args.no_size_limits else SIZE_LIMITS,
+        progress=lambda done, total: print(f"\r{done}/{total}", end="", flush=True),
+    )
+    df = to_frame(records)
+    print()
+
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+    if args.json:
+        df.to_json(args.json, orient="records", indent=1)
+    if not (args.csv or args.json):
+        print(df.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.colors import qualitative
+from py_wanderer import HEURISTICS
+
+from benchmark import DEFAULT_SIZES, run_benchmark, to_frame
+from pathfinding import ALGORITHMS
+
+METRICS = {
+    "Time (ms)": ("time_s", 1000),
+    "Peak memory (KiB)": ("peak_memory_bytes", 1 / 1024),
+    "Expanded nodes": ("expanded_nodes", 1),
+    "Optimality (path / shortest)": ("optimality", 1),
+}
+
+
+def configure_page() -> None:
+    st.set_page_config(page_title="Pathfinding Benchmark", layout="wide")
+    st.markdown("## Pathfinding Benchmark")
+    st.markdown(
+        "Compare algorithms and heuristics over maze size, rooms and seeds. "
+        "Load results written by `python benchmark.py --csv ...` or run a "
+        "small sweep here."
+    )
+
+
+def configure_sidebar() -> pd.DataFrame | None:
+    uploaded = st.sidebar.file_uploader("Benchmark results (CSV)", type="csv")
+    if uploaded is not None:
+        return pd.read_csv(uploaded)
+
+    with st.sidebar.form("run_benchmark"):
+        sizes = st.multiselect("Sizes", DEFAULT_SIZES, DEFAULT_SIZES[:3])
+        room_counts = st.multiselect("Number of rooms", [0, 1, 3, 5], [0, 3])
+        num_seeds = st.slider("Seeds", 1, 20, 3)
+        algorithms = st.multiselect(
+            "Algorithms",
+            ALGORITHMS,
+            ALGORITHMS[:2],
+            format_func=lambda x: x.__name__,
+        )
+        heuristics = st.multiselect(
+            "Heuristics",
+            HEURISTICS,
+            HEURISTICS[:2],
+            format_func=lambda x: x.__name__.title(),
+        )
+        submitted = st.form_submit_button("Run benchmark")
+
+    if submitted:
+        progress = st.progress(0.0, "Running benchmark")
+        st.session_state["benchmark_results"] = to_frame(
+            run_benchmark(
+                sizes=sorted(sizes),
+                room_counts=room_counts,
+                seeds=range(num_seeds),
+                strategies=list(product(algorithms, heuristics)),
+                progress=lambda done, total: progress.progress(
+                    done / total, f"Running benchmark ({done}/{total})"
+                ),
+            )
+        )
+        progress.empty()
+    return st.session_state.get("benchmark_results")
+
+
+def summarize(df: pd.DataFrame, column: str, scale: float) -> pd.DataFrame:
+    """Mean and 95% confidence interval (normal approximation) per strategy and size"""
+    return (
+        df[df["error"].isna()]
+        .assign(
+            strategy=lambda x: x["algorithm"] + ": " + x["heuristic"],
+            value=lambda x: x[column].astype(float) * scale,
+        )
+        .groupby(["strategy", "size"])["value"]
+        .agg(["mean", "std", "count"])
+        .reset_index()
+        .assign(ci=lambda x: 1.96 * x["std"].fillna(0) / np.sqrt(x["count"]))
+    )
+
+
+def plot_metric(summary: pd.DataFrame, metric: str, log_y: bool) -> go.Figure:
+    fig = go.Figure()
+    colors = qualitative.Dark24
+    for i, (strategy, group) in enumerate(summary.groupby("strategy")):
+        color = colors[i % len(colors)]
+        fig.add_trace(
+            go.Scatter(
+                x=group["size"],
+                y=group["mean"],
+                error_y=dict(type="data", array=group["ci"], visible=True),
+                mode="lines+markers",
+                name=strategy,
+                line=dict(color=color),
+            )
+        )
+    fig.update_layout(
+        xaxis_title="Maze size",
+        yaxis_title=metric,
+        xaxis_type="log",
+        yaxis_type="log" if log_y else "linear",
+        legend_title="Strategy",
+        height=550,
+    )
+    return fig
+
+
+def main() -> None:
+    configure_page()
+    df = configure_sidebar()
+    if df is None or df.empty:
+        st.info("Upload benchmark results or run a benchmark from the sidebar.")
+        return
+
+    left, right = st.columns([3, 1])
+    metric = left.selectbox("Metric", list(METRICS))
+    log_y = right.toggle("Log scale", value=metric != "Optimality (path / shortest)")
+    summary = summarize(df, *METRICS[metric])
+    st.plotly_chart(plot_metric(summary, metric, log_y), use_container_width=True)
+    st.caption("Error bars: 95% confidence interval of the mean over seeds and rooms.")
+
+    with st.expander("Raw results"):
+        st.dataframe(df, hide_index=True)
+        st.download_button(
+            "Download CSV", df.to_csv(index=False), "benchmark_results.csv"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Matplotlib figures of the maze apps rendered once to PNG bytes.
+
+`st.pyplot(fig)` on a fresh figure every rerun leaves each figure registered
+with pyplot until the process ends. Here a figure is drawn only when its key
+is not cached, rendered on an Agg canvas, then closed straight away; reruns
+get the cached PNG bytes, to show with `st.image`.
+
+Only the maze apps in this directory use it. The colour explorer draws its
+gradients with PIL and caches them with `st.cache_data` instead.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+MAX_MEMORY_BYTES = 32 * 1024**2
+DPI = 100
+
+
+@dataclass
+class FigureCacheStats:
+    hits: int
+    misses: int
+    entries: int
+    nbytes: int
+    open_figures: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.entries} figures cached ({self.nbytes / 1024**2:.1f} MB), "
+            f"hit rate {self.hit_rate:.0%} ({self.hits}/{self.hits + self.misses}), "
+            f"{self.open_figures} open matplotlib figures"
+        )
+
+
+def render_png(fig: Figure, dpi: int = DPI) -> bytes:
+    """PNG bytes of `fig` drawn on an Agg canvas; the figure is closed after"""
+    try:
+        FigureCanvasAgg(fig)
+        buffer = BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+class FigureCache:
+    """Thread-safe LRU of rendered figures, evicting once `max_bytes` is exceeded.
+
+    Keys are the inputs a figure is drawn from; the drawing function's name
+    is added to them, so different plots never share an entry.
+    """
+
+    def __init__(self, max_bytes: int = MAX_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        # pyplot's figure registry is global: one figure drawn at a time
+        self._draw_lock = threading.Lock()
+
+    def png(
+        self,
+        key: Hashable,
+        draw: Callable[..., Figure],
+        *args,
+        dpi: int = DPI,
+        **kwargs,
+    ) -> bytes:
+        name = hashlib.sha1(
+            repr((draw.__module__, draw.__qualname__, dpi, key)).encode()
+        ).hexdigest()
+        with self._lock:
+            value = self._items.get(name)
+            if value is not None:
+                self._items.move_to_end(name)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        with self._draw_lock:
+            value = render_png(draw(*args, **kwargs), dpi)
+
+        with self._lock:
+            if name in self._items:
+                self.nbytes -= len(self._items.pop(name))
+            self._items[name] = value
+            self.nbytes += len(value)
+            while self.nbytes > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+        return value
+
+    def stats(self) -> FigureCacheStats:
+        with self._lock:
+            return FigureCacheStats(
+                self.hits,
+                self.misses,
+                len(self._items),
+                self.nbytes,
+                len(plt.get_fignums()),
+            )
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,286 @@
+"""
+Hierarchical pathfinding (HPA*) for large mazes.
+
+The grid is cut into square clusters. Wherever open cells face each other
+across a cluster border there is an entrance: one pair of cells, or two for
+long openings. Entrance cells are the nodes of an abstract graph, joined
+across borders (cost 1) and, inside each cluster, to every other entrance
+cell they can reach without leaving it (cost: in-cluster BFS distance).
+
+A query connects start and end to the entrances of their clusters, runs A*
+on the abstract graph, and refines each abstract edge into cells with a BFS
+confined to one cluster. Paths can be a little longer than optimal, since
+routes are restricted to the entrances.
+
+To run:
+> python hpa.py --size 2001 --cluster-size 32 --queries 20
+"""
+
+import argparse
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from heapq import heappop, heappush
+from time import perf_counter
+
+import numpy as np
+
+from utils import MazePath, generate_grid, shortest_path_length
+
+DEFAULT_CLUSTER_SIZE = 32
+# Openings at least this long get an entrance at both ends instead of one
+# in the middle
+LONG_ENTRANCE = 6
+
+
+@dataclass
+class HPAResult:
+    path: MazePath
+    abstract_expanded: int
+    time_s: float
+
+    @property
+    def path_length(self) -> int | None:
+        return len(self.path) - 1 if self.path else None
+
+
+def _border_entrances(
+    open_a: np.ndarray, open_b: np.ndarray, cluster_size: int
+) -> list[int]:
+    """Positions along a border of the entrances between two rows of cells"""
+    both = open_a & open_b
+    # Openings never span two clusters along the border
+    both = np.concatenate([both, [False]])
+    positions = []
+    for begin in range(0, len(both) - 1, cluster_size):
+        segment = both[begin : begin + cluster_size]
+        edges = np.diff(np.concatenate([[0], segment.astype(np.int8), [0]]))
+        for run_start, run_end in zip(
+            np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        ):
+            if run_end - run_start >= LONG_ENTRANCE:
+                positions += [begin + run_start, begin + run_end - 1]
+            else:
+                positions.append(begin + (run_start + run_end - 1) // 2)
+    return positions
+
+
+class AbstractGraph:
+    """Entrances of a grid's clusters and the distances between them"""
+
+    def __init__(self, grid: np.ndarray, cluster_size: int = DEFAULT_CLUSTER_SIZE):
+        t0 = perf_counter()
+        self.grid = np.asarray(grid, dtype=np.uint8)
+        self.height, self.width = self.grid.shape
+        self.cluster_size = cluster_size
+        rows = np.arange(self.height) // cluster_size
+        cols = np.arange(self.width) // cluster_size
+        self.cluster_cols = int(cols[-1]) + 1
+        self.cluster = (
+            (rows[:, None] * self.cluster_cols + cols[None, :]).ravel().astype(np.int32)
+        )
+        self.open = (self.grid == 0).ravel()
+        # Memoryviews index much faster than arrays in the per-query loops
+        self._cluster_of = memoryview(self.cluster)
+        self._is_open = memoryview(self.open.view(np.uint8))
+        self.edges: dict[int, dict[int, int]] = defaultdict(dict)
+
+        for x in range(cluster_size, self.width, cluster_size):
+            for y in _border_entrances(
+                self.grid[:, x - 1] == 0, self.grid[:, x] == 0, cluster_size
+            ):
+                self._link(y * self.width + x - 1, y * self.width + x, 1)
+        for y in range(cluster_size, self.height, cluster_size):
+            for x in _border_entrances(
+                self.grid[y - 1] == 0, self.grid[y] == 0, cluster_size
+            ):
+                self._link((y - 1) * self.width + x, y * self.width + x, 1)
+
+        self._link_within_clusters()
+        self.cluster_nodes: dict[int, set[int]] = defaultdict(set)
+        for node in self.edges:
+            self.cluster_nodes[self._cluster_of[node]].add(node)
+        self.build_time_s = perf_counter() - t0
+
+    def _link(self, a: int, b: int, cost: int) -> None:
+        self.edges[a][b] = cost
+        self.edges[b][a] = cost
+
+    def _link_within_clusters(self) -> None:
+        """BFS from every entrance cell, confined to its cluster.
+
+        The k-th entrance cells of all clusters are searched together in one
+        level-by-level numpy sweep: the searches never leave their own
+        cluster, so they can share one distance array.
+        """
+        nodes = np.array(sorted(self.edges), dtype=np.int64)
+        if not len(nodes):
+            return
+        node_cluster = self.cluster[nodes]
+        order = np.argsort(node_cluster, kind="stable")
+        nodes, node_cluster = nodes[order], node_cluster[order]
+        first = np.searchsorted(node_cluster, node_cluster)
+        rank = np.arange(len(nodes)) - first
+
+        offsets = np.array([1, -1, self.width, -self.width])
+        dist = np.empty(self.grid.size, dtype=np.int32)
+        for k in range(int(rank.max()) + 1):
+            sources = nodes[rank == k]
+            dist.fill(-1)
+            dist[sources] = 0
+            frontier, level = sources, 0
+            while len(frontier):
+                level += 1
+                neighbors = (frontier[:, None] + offsets).ravel()
+                inside = (neighbors >= 0) & (neighbors < self.grid.size)
+                parents = np.repeat(frontier, len(offsets))[inside]
+                neighbors = neighbors[inside]
+                keep = (
+                    self.open[neighbors]
+                    & (dist[neighbors] < 0)
+                    & (self.cluster[neighbors] == self.cluster[parents])
+                )
+                frontier = np.unique(neighbors[keep])
+                dist[frontier] = level
+
+            reached = dist[nodes] > 0
+            for source, target, d in zip(
+                nodes[rank == k][
+                    np.searchsorted(node_cluster[rank == k], node_cluster[reached])
+                ].tolist(),
+                nodes[reached].tolist(),
+                dist[nodes][reached].tolist(),
+            ):
+                if source != target:
+                    self._link(source, target, d)
+
+    def _cluster_bfs(self, source: int, targets: set[int]) -> dict[int, list[int]]:
+        """In-cluster shortest paths from `source` to the reachable `targets`"""
+        cluster_of, is_open, size = self._cluster_of, self._is_open, self.grid.size
+        cluster = cluster_of[source]
+        came_from = {source: None}
+        queue = deque([source])
+        found = {}
+        while queue and len(found) < len(targets):
+            node = queue.popleft()
+            if node in targets:
+                path = []
+                cell = node
+                while cell is not None:
+                    path.append(cell)
+                    cell = came_from[cell]
+                found[node] = path[::-1]
+            for offset in (1, -1, self.width, -self.width):
+                neighbor = node + offset
+                if (
+                    0 <= neighbor < size
+                    and neighbor not in came_from
+                    and is_open[neighbor]
+                    and cluster_of[neighbor] == cluster
+                ):
+                    came_from[neighbor] = node
+                    queue.append(neighbor)
+        return found
+
+    def find_path(self, start: tuple[int, int], end: tuple[int, int]) -> HPAResult:
+        t0 = perf_counter()
+        source = start[0] * self.width + start[1]
+        target = end[0] * self.width + end[1]
+
+        # Temporary edges from start and end into their clusters' entrances
+        extra: dict[int, dict[int, int]] = defaultdict(dict)
+        to_start = self._cluster_bfs(
+            source, self.cluster_nodes[self._cluster_of[source]] | {target}
+        )
+        for node, cells in to_start.items():
+            extra[source][node] = len(cells) - 1
+        for node, cells in self._cluster_bfs(
+            target, self.cluster_nodes[self._cluster_of[target]]
+        ).items():
+            extra[node][target] = len(cells) - 1
+
+        def neighbors(node):
+            yield from self.edges.get(node, {}).items()
+            yield from extra.get(node, {}).items()
+
+        def heuristic(node):
+            return abs(node // self.width - end[0]) + abs(node % self.width - end[1])
+
+        g_score = {source: 0}
+        came_from = {source: None}
+        open_set = [(heuristic(source), source)]
+        closed = set()
+        expanded = 0
+        while open_set:
+            node = heappop(open_set)[1]
+            if node in closed:
+                continue
+            if node == target:
+                break
+            closed.add(node)
+            expanded += 1
+            for neighbor, cost in neighbors(node):
+                tentative_g_score = g_score[node] + cost
+                if tentative_g_score < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = tentative_g_score
+                    came_from[neighbor] = node
+                    heappush(
+                        open_set, (tentative_g_score + heuristic(neighbor), neighbor)
+                    )
+        else:
+            return HPAResult([], expanded, perf_counter() - t0)
+
+        abstract = [target]
+        while came_from[abstract[-1]] is not None:
+            abstract.append(came_from[abstract[-1]])
+        abstract.reverse()
+
+        cells = [source]
+        for a, b in zip(abstract, abstract[1:]):
+            if self._cluster_of[a] != self._cluster_of[b]:
+                cells.append(b)
+            else:
+                cells += self._cluster_bfs(a, {b})[b][1:]
+        path = [divmod(cell, self.width) for cell in cells]
+        return HPAResult(path, expanded, perf_counter() - t0)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.edges)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1001)
+    parser.add_argument("--rooms", type=int, default=5)
+    parser.add_argument("--cluster-size", type=int, default=DEFAULT_CLUSTER_SIZE)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = generate_grid(args.seed, args.size, args.size, args.rooms, (20, 80))
+    graph = AbstractGraph(grid, args.cluster_size)
+    print(
+        f"abstract graph: {graph.num_nodes} nodes, built in "
+        f"{graph.build_time_s:.2f} s"
+    )
+    rng = np.random.default_rng(args.seed)
+    open_cells = np.argwhere(grid == 0)
+    rows = grid.tolist()
+    ratios, times = [], []
+    for _ in range(args.queries):
+        start, end = (
+            tuple(c) for c in open_cells[rng.integers(len(open_cells), size=2)].tolist()
+        )
+        result = graph.find_path(start, end)
+        optimal = shortest_path_length(rows, start, end)
+        if optimal:
+            ratios.append(result.path_length / optimal)
+            times.append(result.time_s)
+    print(
+        f"{len(ratios)} queries: mean {1000 * np.mean(times):.1f} ms, "
+        f"path / shortest mean {np.mean(ratios):.3f}, max {np.max(ratios):.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Lifelong Planning A* (LPA*) on an editable maze, and a benchmark against
+solving from scratch after every wall toggle.
+
+LPA* keeps its g-values and priority queue between searches; toggling a wall
+only makes that cell and its neighbours inconsistent, and the next search
+repairs the part of the search tree that depends on them.
+
+To run:
+> python incremental.py --size 201 --rooms 3 --toggles 50
+"""
+
+import argparse
+from heapq import heappop, heappush
+from statistics import mean
+from time import perf_counter
+
+import numpy as np
+from py_wanderer import AStar, Heuristic, chebyshev, euclidean, manhattan, octile
+
+from solvers import ExpansionCounter
+from utils import MazePath, generate_maze
+
+INF = float("inf")
+# Heuristics that never drop by more than one per unit step and are 0 at the
+# goal. LPA* needs that consistency: with others its g-values are wrong.
+CONSISTENT_HEURISTICS = (manhattan, euclidean, chebyshev, octile)
+
+
+def consistent_heuristic(heuristic: Heuristic) -> Heuristic:
+    """`heuristic` if LPA* can plan with it, Manhattan otherwise"""
+    return heuristic if heuristic in CONSISTENT_HEURISTICS else manhattan
+
+
+class LPAStar:
+    """Shortest path from `start` to `goal` on a 4-connected grid with unit
+    steps, kept up to date as walls are toggled.
+
+    The heuristic must be consistent, see CONSISTENT_HEURISTICS.
+    """
+
+    def __init__(
+        self,
+        grid: list[list[int]],
+        start: tuple[int, int],
+        goal: tuple[int, int],
+        heuristic: Heuristic = manhattan,
+    ):
+        self.grid = [row[:] for row in grid]
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic
+        self.g: dict[tuple[int, int], float] = {}
+        self.rhs: dict[tuple[int, int], float] = {start: 0}
+        self.queue: list = []
+        self.queued: dict[tuple[int, int], tuple[float, float]] = {}
+        self.expanded_nodes = 0
+        self._push(start)
+
+    def key(self, node: tuple[int, int]) -> tuple[float, float]:
+        best = min(self.g.get(node, INF), self.rhs.get(node, INF))
+        return best + self.heuristic(node, self.goal), best
+
+    def _push(self, node: tuple[int, int]) -> None:
+        key = self.key(node)
+        self.queued[node] = key
+        heappush(self.queue, (key, node))
+
+    def neighbors(self, node: tuple[int, int]) -> list[tuple[int, int]]:
+        x, y = node
+        grid = self.grid
+        return [
+            (nx, ny)
+            for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y))
+            if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]) and not grid[nx][ny]
+        ]
+
+    def update_vertex(self, node: tuple[int, int]) -> None:
+        if node != self.start:
+            x, y = node
+            self.rhs[node] = (
+                INF
+                if self.grid[x][y]
+                else min(
+                    (self.g.get(n, INF) + 1 for n in self.neighbors(node)), default=INF
+                )
+            )
+        self.queued.pop(node, None)
+        if self.g.get(node, INF) != self.rhs.get(node, INF):
+            self._push(node)
+
+    def compute_shortest_path(self) -> int:
+        """Repair the search; returns the number of nodes expanded"""
+        expanded = 0
+        while self.queue:
+            key, node = self.queue[0]
+            if self.queued.get(node) != key:
+                heappop(self.queue)
+                continue
+            goal_g, goal_rhs = self.g.get(self.goal, INF), self.rhs.get(self.goal, INF)
+            if key >= self.key(self.goal) and goal_g == goal_rhs:
+                break
+            heappop(self.queue)
+            del self.queued[node]
+            expanded += 1
+            g, rhs = self.g.get(node, INF), self.rhs.get(node, INF)
+            if g > rhs:
+                self.g[node] = rhs
+            else:
+                self.g[node] = INF
+                self.update_vertex(node)
+            for neighbor in self.neighbors(node):
+                self.update_vertex(neighbor)
+        self.expanded_nodes += expanded
+        return expanded
+
+    def toggle_wall(self, cell: tuple[int, int]) -> None:
+        if cell in (self.start, self.goal):
+            raise ValueError("start and goal cannot be walls")
+        x, y = cell
+        self.grid[x][y] ^= 1
+        self.update_vertex(cell)
+        for neighbor in self.neighbors(cell):
+            self.update_vertex(neighbor)
+
+    def path(self) -> MazePath:
+        if self.g.get(self.goal, INF) == INF:
+            return []
+        path = [self.goal]
+        while path[-1] != self.start:
+            g = self.g.get(path[-1], INF)
+            step = min(self.neighbors(path[-1]), key=lambda n: self.g.get(n, INF))
+            # Consistent g-values drop on every step back; anything else would loop
+            if not self.g.get(step, INF) < g:
+                raise RuntimeError(f"LPA* g-values do not lead back from {path[-1]}")
+            path.append(step)
+        return path[::-1]
+
+
+def toggle_candidates(
+    grid: list[list[int]], start: tuple[int, int], end: tuple[int, int]
+) -> np.ndarray:
+    """Interior cells other than start and end"""
+    mask = np.zeros((len(grid), len(grid[0])), dtype=bool)
+    mask[1:-1, 1:-1] = True
+    mask[start] = mask[end] = False
+    return np.argwhere(mask)
+
+
+def benchmark(
+    size: int, num_rooms: int, toggles: int, seed: int = 0, near_path: bool = True
+) -> dict:
+    """Mean repair time / expansions per toggle, LPA* against A* from scratch.
+
+    With `near_path`, toggled cells are picked next to the current path,
+    where edits actually change the answer.
+    """
+    maze = generate_maze(seed, size, size, num_rooms, (3, 6))
+    planner = LPAStar(maze.maze, maze.start, maze.end)
+    planner.compute_shortest_path()
+    rng = np.random.default_rng(seed)
+    candidates = toggle_candidates(maze.maze, maze.start, maze.end)
+
+    repair_times, repair_expanded, full_times, full_expanded = [], [], [], []
+    for _ in range(toggles):
+        if near_path and (path := planner.path()):
+            x, y = path[rng.integers(len(path))]
+            dx, dy = ((0, 1), (1, 0), (0, -1), (-1, 0))[rng.integers(4)]
+            cell = (x + dx, y + dy)
+            if cell in (maze.start, maze.end) or not (
+                0 < cell[0] < size - 1 and 0 < cell[1] < size - 1
+            ):
+                continue
+        else:
+            cell = tuple(candidates[rng.integers(len(candidates))].tolist())
+
+        t0 = perf_counter()
+        planner.toggle_wall(cell)
+        repair_expanded.append(planner.compute_shortest_path())
+        repair_times.append(perf_counter() - t0)
+
+        astar = AStar(planner.grid, maze.start, maze.end, manhattan)
+        counter = ExpansionCounter(astar)
+        t0 = perf_counter()
+        full_path = astar.run()
+        full_times.append(perf_counter() - t0)
+        full_expanded.append(counter.expanded)
+        if len(full_path) != len(planner.path()):
+            raise RuntimeError(f"LPA* and A* path lengths differ after toggling {cell}")
+
+    return {
+        "toggles": len(repair_times),
+        "repair_ms": 1000 * mean(repair_times),
+        "repair_expanded": mean(repair_expanded),
+        "full_ms": 1000 * mean(full_times),
+        "full_expanded": mean(full_expanded),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=101)
+    parser.add_argument("--rooms", type=int, default=3)
+    parser.add_argument("--toggles", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--anywhere", action="store_true", help="toggle random cells, not near path"
+    )
+    args = parser.parse_args()
+    result = benchmark(
+        args.size, args.rooms, args.toggles, args.seed, near_path=not args.anywhere
+    )
+    print(
+        f"{result['toggles']} toggles: LPA* repair {result['repair_ms']:.2f} ms "
+        f"({result['repair_expanded']:.0f} expanded), A* from scratch "
+        f"{result['full_ms']:.2f} ms ({result['full_expanded']:.0f} expanded)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from time import perf_counter
+
+from py_wanderer import Maze
+
+from maze_cache import strategy_name
+from solvers import ExpansionCounter
+from utils import MazePath, SolvingStrategies, SolvingStrategy
+
+
+@dataclass
+class SearchCounters:
+    name: str
+    expanded_nodes: int = 0
+    heuristic_evals: int = 0
+    # None for algorithms that keep their own frontier instead of open_set
+    peak_frontier: int | None = None
+    time_s: float = 0.0
+
+    def as_row(self) -> dict:
+        return {
+            "Strategy": self.name,
+            "Expanded nodes": self.expanded_nodes,
+            "Peak frontier": self.peak_frontier,
+            "Heuristic evaluations": self.heuristic_evals,
+            "Time (ms)": round(self.time_s * 1000, 2),
+        }
+
+
+def solve_counted(
+    maze: Maze, strategy: SolvingStrategy
+) -> tuple[MazePath, SearchCounters]:
+    """Solve like `maze.solve`, counting through a wrapped heuristic and
+    a wrapped get_neighbors (called once per expanded node).
+
+    The frontier is sampled at every expansion and at the end: the size
+    reported by the pathfinder's `frontier_size()` (BidirectionalAStar,
+    JumpPointSearch), or else the length of py_wanderer's `open_set` heap.
+    The py_wanderer algorithms that never pop the start node from that heap
+    (DFS, Swarm, IDDFS, Bellman-Ford) report no peak frontier.
+    """
+    algorithm, heuristic = strategy
+    counters = SearchCounters(strategy_name(strategy))
+
+    def counted_heuristic(a, b):
+        counters.heuristic_evals += 1
+        return heuristic(a, b)
+
+    pathfinder = algorithm(maze.maze, maze.start, maze.end, counted_heuristic)
+    open_set = pathfinder.open_set
+    initial_entry = open_set[0]
+    own_frontier = hasattr(pathfinder, "frontier_size")
+    frontier_size = pathfinder.frontier_size if own_frontier else open_set.__len__
+    counter = ExpansionCounter(pathfinder, frontier=frontier_size)
+    t0 = perf_counter()
+    path = pathfinder.run()
+    counters.time_s = perf_counter() - t0
+    counters.expanded_nodes = counter.expanded
+    if own_frontier or not open_set or open_set[0] is not initial_entry:
+        counters.peak_frontier = max(counter.peak_frontier, frontier_size())
+    return path, counters
+
+
+def solve_many(
+    maze: Maze, strategies: SolvingStrategies, enabled: bool = True
+) -> tuple[list[tuple[str, MazePath]], list[SearchCounters]]:
+    """`maze.solve_many` with counters; when disabled it is exactly that call"""
+    if not enabled:
+        return maze.solve_many(list(strategies)), []
+    paths, counters = [], []
+    for strategy in strategies:
+        path, strategy_counters = solve_counted(maze, strategy)
+        paths.append((strategy_counters.name, path))
+        counters.append(strategy_counters)
+    return paths, counters
@@ -0,0 +1,135 @@
+from array import array
+from collections import deque
+
+import numpy as np
+
+from utils import SolvingStrategies
+
+DEFAULT_LANDMARKS = 8
+# Targets whose heuristic row is kept; bidirectional searches use two
+MAX_TARGET_ROWS = 4
+
+
+def bfs_distances(grid: np.ndarray, source: tuple[int, int]) -> np.ndarray:
+    """Steps from `source` to every cell as an int32 grid, -1 if unreachable"""
+    height, width = grid.shape
+    open_cells = (grid.ravel() == 0).tolist()
+    dist = [-1] * (height * width)
+    start = source[0] * width + source[1]
+    dist[start] = 0
+    queue = deque([start])
+    # Borders are walls, so +-1 never wraps to another row
+    offsets = (1, -1, width, -width)
+    while queue:
+        node = queue.popleft()
+        next_dist = dist[node] + 1
+        for offset in offsets:
+            neighbor = node + offset
+            if open_cells[neighbor] and dist[neighbor] < 0:
+                dist[neighbor] = next_dist
+                queue.append(neighbor)
+    return np.array(dist, dtype=np.int32).reshape(height, width)
+
+
+def select_landmarks(
+    grid: np.ndarray, seed_cell: tuple[int, int], count: int
+) -> tuple[list[tuple[int, int]], np.ndarray]:
+    """Farthest-point landmarks and their distance fields, shape (count, H, W).
+
+    The first landmark is the cell farthest from `seed_cell`, each next one
+    the cell farthest from all landmarks chosen so far.
+    """
+    nearest = bfs_distances(grid, seed_cell)
+    landmarks, fields = [], []
+    for _ in range(count):
+        cell = np.unravel_index(np.argmax(nearest), grid.shape)
+        landmark = (int(cell[0]), int(cell[1]))
+        if nearest[landmark] <= 0:
+            break
+        field = bfs_distances(grid, landmark)
+        landmarks.append(landmark)
+        fields.append(field)
+        nearest = np.where(field >= 0, np.minimum(nearest, field), nearest)
+    return landmarks, np.stack(fields) if fields else np.zeros((0, *grid.shape))
+
+
+class LandmarkHeuristic:
+    """ALT heuristic: triangle-inequality bounds from landmark distance fields.
+
+    For a landmark L, |d(L, a) - d(L, b)| <= d(a, b), so the largest bound
+    over the landmarks is admissible, and so is its max with the Manhattan
+    distance. The Manhattan term keeps h(a, b) = 1 for adjacent cells, which
+    py_wanderer's A* also uses as the step cost.
+
+    Searches ask for h towards one goal over and over, so the bounds from
+    every cell to a target are computed once, as one row of ints.
+    """
+
+    def __init__(
+        self,
+        grid: np.ndarray,
+        seed_cell: tuple[int, int] = (1, 1),
+        num_landmarks: int = DEFAULT_LANDMARKS,
+    ):
+        # Part of strategy labels, which also key the path cache
+        self.__name__ = f"alt ({num_landmarks} landmarks)"
+        self.width = grid.shape[1]
+        self.landmarks, fields = select_landmarks(grid, seed_cell, num_landmarks)
+        # One contiguous int32 row of landmark distances per cell
+        self.fields = np.ascontiguousarray(
+            fields.reshape(len(self.landmarks), -1).T, dtype=np.int32
+        )
+        self._rows: dict[tuple[int, int], array] = {}
+
+    @classmethod
+    def from_fields(
+        cls,
+        name: str,
+        width: int,
+        landmarks: list[tuple[int, int]],
+        fields: np.ndarray,
+    ) -> "LandmarkHeuristic":
+        """A heuristic over distance fields computed elsewhere (cells x landmarks)"""
+        heuristic = cls.__new__(cls)
+        heuristic.__name__ = name
+        heuristic.width = width
+        heuristic.landmarks = landmarks
+        heuristic.fields = fields
+        heuristic._rows = {}
+        return heuristic
+
+    def row(self, target: tuple[int, int]) -> array:
+        """h from every cell (flat index) to `target`"""
+        row = self._rows.get(target)
+        if row is None:
+            bound = np.abs(
+                self.fields - self.fields[target[0] * self.width + target[1]]
+            ).max(axis=1, initial=0)
+            rows, cols = np.divmod(np.arange(len(self.fields)), self.width)
+            manhattan = np.abs(rows - target[0]) + np.abs(cols - target[1])
+            row = array("i", np.maximum(bound, manhattan).astype(np.int32).tobytes())
+            if len(self._rows) >= MAX_TARGET_ROWS:
+                self._rows.pop(next(iter(self._rows)))
+            self._rows[target] = row
+        return row
+
+    def __call__(self, a: tuple[int, int], b: tuple[int, int]) -> float:
+        manhattan = abs(a[0] - b[0]) + abs(a[1] - b[1])
+        # Adjacent cells (A*'s step cost): no landmark bound exceeds 1
+        if manhattan <= 1 or not self.landmarks:
+            return manhattan
+        return self.row(b)[a[0] * self.width + a[1]]
+
+
+def alt(a: tuple[int, int], b: tuple[int, int]) -> float:
+    """Sidebar option for the ALT heuristic, see `with_landmarks`"""
+    raise RuntimeError("alt needs the maze's landmarks: resolve it with with_landmarks")
+
+
+def with_landmarks(
+    strategies: SolvingStrategies, heuristic: LandmarkHeuristic
+) -> SolvingStrategies:
+    """Strategies with the `alt` placeholder replaced by a maze's heuristic"""
+    return tuple(
+        (algorithm, heuristic if h is alt else h) for algorithm, h in strategies
+    )
@@ -0,0 +1,173 @@
+"""
+Generate and solve mazes in bulk, written as sharded NPZ files.
+
+Every (size, rooms, seed) combination is one maze; consecutive mazes are
+grouped into shards of `--shard-size` that worker processes generate, solve
+and write on their own. A shard holds the bit-packed walls of its mazes and
+one path length per strategy (-1: no path). Finished shards are skipped when
+the command is run again with the same parameters, so an interrupted run
+resumes where it stopped.
+
+To run:
+> python make_dataset.py data/mazes --seeds 0 10000 --sizes 21 51 --rooms 0 3 \\
+      --algorithms AStar JumpPointSearch --heuristics manhattan
+"""
+
+import argparse
+import json
+import os
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+from py_wanderer import HEURISTICS
+
+from benchmark import by_name
+from pathfinding import ALGORITHMS
+from solvers import make_executor
+from utils import GENERATORS, shortest_path_length
+
+MANIFEST = "manifest.json"
+
+
+def shard_path(out_dir: Path, index: int) -> Path:
+    return out_dir / f"shard-{index:05d}.npz"
+
+
+def build_shard(
+    path: Path,
+    configs: list[tuple[int, int, int]],
+    generator: str,
+    room_size_range: tuple[int, int],
+    algorithms: list[str],
+    heuristics: list[str],
+) -> int:
+    """Generate, solve and write one shard; returns the number of mazes"""
+    strategies = list(
+        product(by_name(ALGORITHMS, algorithms), by_name(HEURISTICS, heuristics))
+    )
+    bits, shapes = [], []
+    path_lengths = np.full((len(configs), len(strategies)), -1, dtype=np.int32)
+    optimal_lengths = np.full(len(configs), -1, dtype=np.int32)
+    for i, (size, num_rooms, seed) in enumerate(configs):
+        maze = GENERATORS[generator](seed, size, size, num_rooms, room_size_range)
+        grid = np.asarray(maze.maze, dtype=bool)
+        bits.append(np.packbits(grid))
+        shapes.append(grid.shape)
+        optimal_lengths[i] = shortest_path_length(maze.maze, maze.start, maze.end) or -1
+        for j, strategy in enumerate(strategies):
+            if found := maze.solve(*strategy):
+                path_lengths[i, j] = len(found) - 1
+
+    tmp = path.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(
+        tmp,
+        bits=np.concatenate(bits),
+        bit_offsets=np.cumsum([0] + [b.size for b in bits]),
+        shapes=np.array(shapes, dtype=np.int32),
+        configs=np.array(configs, dtype=np.int64),
+        optimal_lengths=optimal_lengths,
+        path_lengths=path_lengths,
+    )
+    os.replace(tmp, path)
+    return len(configs)
+
+
+def iter_mazes(out_dir: Path) -> Iterator[dict]:
+    """Every maze of a dataset: its grid, config and path lengths"""
+    manifest = json.loads((Path(out_dir) / MANIFEST).read_text())
+    for index in range(manifest["num_shards"]):
+        with np.load(shard_path(Path(out_dir), index)) as shard:
+            bits, offsets = shard["bits"], shard["bit_offsets"]
+            for i, (height, width) in enumerate(shard["shapes"]):
+                grid = np.unpackbits(
+                    bits[offsets[i] : offsets[i + 1]], count=height * width
+                ).reshape(height, width)
+                size, num_rooms, seed = shard["configs"][i].tolist()
+                yield {
+                    "grid": grid,
+                    "size": size,
+                    "num_rooms": num_rooms,
+                    "seed": seed,
+                    "optimal_length": int(shard["optimal_lengths"][i]),
+                    "path_lengths": dict(
+                        zip(manifest["strategies"], shard["path_lengths"][i].tolist())
+                    ),
+                }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument(
+        "--seeds", type=int, nargs=2, default=(0, 100), metavar=("START", "STOP")
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=(21,))
+    parser.add_argument("--rooms", type=int, nargs="+", default=(0,))
+    parser.add_argument("--room-size-range", type=int, nargs=2, default=(3, 6))
+    parser.add_argument("--generator", choices=list(GENERATORS), default="backtracker")
+    parser.add_argument("--algorithms", nargs="*", default=[ALGORITHMS[0].__name__])
+    parser.add_argument("--heuristics", nargs="*", default=[HEURISTICS[0].__name__])
+    parser.add_argument("--shard-size", type=int, default=256)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    configs = list(product(args.sizes, args.rooms, range(*args.seeds)))
+    shards = [
+        configs[i : i + args.shard_size]
+        for i in range(0, len(configs), args.shard_size)
+    ]
+    algorithms = [a.__name__ for a in by_name(ALGORITHMS, args.algorithms)]
+    heuristics = [h.__name__ for h in by_name(HEURISTICS, args.heuristics)]
+    manifest = {
+        "seeds": list(args.seeds),
+        "sizes": list(args.sizes),
+        "rooms": list(args.rooms),
+        "room_size_range": list(args.room_size_range),
+        "generator": args.generator,
+        "shard_size": args.shard_size,
+        "num_shards": len(shards),
+        "strategies": [f"{a}: {h}" for a, h in product(algorithms, heuristics)],
+    }
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = args.out_dir / MANIFEST
+    if manifest_path.exists():
+        if json.loads(manifest_path.read_text()) != manifest:
+            parser.error(f"{args.out_dir} holds a dataset with other parameters")
+    else:
+        manifest_path.write_text(json.dumps(manifest, indent=1))
+
+    todo = [i for i in range(len(shards)) if not shard_path(args.out_dir, i).exists()]
+    print(f"{len(shards) - len(todo)}/{len(shards)} shards already done")
+    # At most two shards per worker in flight keeps memory bounded
+    max_pending = 2 * (args.workers or os.cpu_count() or 1)
+    with make_executor(args.workers) as executor:
+        pending, done = set(), len(shards) - len(todo)
+        for index in todo:
+            if len(pending) >= max_pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    future.result()
+                done += len(finished)
+                print(f"\r{done}/{len(shards)} shards", end="", flush=True)
+            pending.add(
+                executor.submit(
+                    build_shard,
+                    shard_path(args.out_dir, index),
+                    shards[index],
+                    args.generator,
+                    tuple(args.room_size_range),
+                    algorithms,
+                    heuristics,
+                )
+            )
+        for future in wait(pending).done:
+            future.result()
+    print(f"\r{len(shards)}/{len(shards)} shards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import py_wanderer
+from py_wanderer import Maze
+
+import serialize
+from utils import (
+    MazeConfig,
+    MazePath,
+    SolvingStrategies,
+    SolvingStrategy,
+    build_maze,
+)
+
+CACHE_DIR = Path(
+    os.environ.get("MAZE_CACHE_DIR", Path(__file__).resolve().parent / ".maze_cache")
+)
+MAX_MEMORY_BYTES = 64 * 1024**2
+
+
+def maze_key(maze_config: MazeConfig) -> tuple:
+    # The library version is part of the key as mazes depend on its RNG usage,
+    # the file format version so older cache files are never read
+    return (
+        py_wanderer.__version__,
+        serialize.VERSION,
+        maze_config.seed,
+        maze_config.width,
+        maze_config.height,
+        maze_config.num_rooms,
+        tuple(maze_config.room_size_range),
+        maze_config.generator,
+    )
+
+
+def strategy_name(strategy: SolvingStrategy) -> str:
+    algorithm, heuristic = strategy
+    return f"{algorithm.__name__}: {heuristic.__name__}"
+
+
+def _digest(key: tuple) -> str:
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def pack_path(path: MazePath) -> bytes:
+    return np.asarray(path, dtype=np.int32).reshape(-1, 2).tobytes()
+
+
+def unpack_path(data: bytes) -> MazePath:
+    return [
+        tuple(cell)
+        for cell in np.frombuffer(data, dtype=np.int32).reshape(-1, 2).tolist()
+    ]
+
+
+class LRUCache:
+    """Thread-safe LRU of bytes values, evicting once `max_bytes` is exceeded"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= len(self._items.pop(key))
+            self._items[key] = value
+            self.nbytes += len(value)
+            while self.nbytes > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class MazeCache:
+    """In-memory LRU in front of an on-disk store of packed mazes and paths.
+
+    Mazes are keyed by their generation parameters, paths additionally by the
+    solving strategy, so adding a strategy only solves that one.
+    """
+
+    def __init__(self, max_bytes: int = MAX_MEMORY_BYTES, cache_dir: Path = CACHE_DIR):
+        self.memory = LRUCache(max_bytes)
+        self.cache_dir = cache_dir
+
+    def _load(self, name: str) -> bytes | None:
+        value = self.memory.get(name)
+        if value is None:
+            try:
+                value = (self.cache_dir / name).read_bytes()
+            except FileNotFoundError:
+                return None
+            self.memory.put(name, value)
+        return value
+
+    def _store(self, name: str, value: bytes) -> None:
+        self.memory.put(name, value)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f"{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_bytes(value)
+        os.replace(tmp, self.cache_dir / name)
+
+    def get_maze(self, maze_config: MazeConfig) -> Maze:
+        name = f"{_digest(maze_key(maze_config))}.maze"
+        data = self._load(name)
+        if data is not None:
+            return serialize.loads(data)
+
+        maze = build_maze(maze_config)
+        self._store(name, serialize.dumps(maze))
+        return maze
+
+    def put_maze(self, maze_config: MazeConfig, maze: Maze) -> None:
+        """Cache a maze that was not generated from `maze_config`, e.g. a loaded one"""
+        name = f"{_digest(maze_key(maze_config))}.maze"
+        if self._load(name) is None:
+            self._store(name, serialize.dumps(maze))
+
+    def _path_name(self, maze_config: MazeConfig, strategy: SolvingStrategy) -> str:
+        return f"{_digest((*maze_key(maze_config), strategy_name(strategy)))}.path"
+
+    def get_path(
+        self, maze_config: MazeConfig, strategy: SolvingStrategy
+    ) -> MazePath | None:
+        """Cached path of one strategy, or None when it was never solved"""
+        data = self._load(self._path_name(maze_config, strategy))
+        return None if data is None else unpack_path(data)
+
+    def put_path(
+        self, maze_config: MazeConfig, strategy: SolvingStrategy, path: MazePath
+    ) -> None:
+        self._store(self._path_name(maze_config, strategy), pack_path(path))
+
+    def get_paths(
+        self, maze_config: MazeConfig, maze: Maze, strategies: SolvingStrategies
+    ) -> list[tuple[str, MazePath]]:
+        paths = []
+        for strategy in strategies:
+            path = self.get_path(maze_config, strategy)
+            if path is None:
+                path = maze.solve(*strategy)
+                self.put_path(maze_config, strategy, path)
+            paths.append((strategy_name(strategy), path))
+        return paths
+
+
+maze_cache = MazeCache()
@@ -0,0 +1,164 @@
+from heapq import heappop, heappush
+from itertools import count
+
+import py_wanderer
+from py_wanderer import PathfindingAlgorithm
+
+
+class BidirectionalAStar(PathfindingAlgorithm):
+    """A* from both ends at once, with unit step costs.
+
+    Each round expands the side with the smaller open set; equal f-scores
+    go to the node nearer its target. The search stops
+    once either side's lowest f-score reaches the best meeting cost found,
+    which keeps the path optimal for consistent heuristics.
+    """
+
+    open_sets: tuple[list, ...] = ()
+
+    def frontier_size(self) -> int:
+        """Entries in the open sets of both sides"""
+        return sum(len(open_set) for open_set in self.open_sets)
+
+    def run(self) -> list[tuple[int, int]]:
+        if self.start == self.goal:
+            return [self.start]
+        tie = count()
+        sides = []
+        for source, target in ((self.start, self.goal), (self.goal, self.start)):
+            h_score = self.heuristic_function(source, target)
+            open_set = [(h_score, h_score, next(tie), source)]
+            sides.append((open_set, {source: 0}, {source: None}, set(), target))
+        self.open_sets = tuple(side[0] for side in sides)
+
+        best, meet = float("inf"), None
+        while sides[0][0] and sides[1][0]:
+            if max(sides[0][0][0][0], sides[1][0][0][0]) >= best:
+                break
+            forward = len(sides[0][0]) <= len(sides[1][0])
+            open_set, g_score, came_from, closed, target = sides[not forward]
+            other_g = sides[forward][1]
+
+            current = heappop(open_set)[3]
+            if current in closed:
+                continue
+            closed.add(current)
+            for neighbor in self.get_neighbors(current):
+                tentative_g_score = g_score[current] + 1
+                if tentative_g_score < g_score.get(neighbor, float("inf")):
+                    g_score[neighbor] = tentative_g_score
+                    came_from[neighbor] = current
+                    h_score = self.heuristic_function(neighbor, target)
+                    heappush(
+                        open_set,
+                        (tentative_g_score + h_score, h_score, next(tie), neighbor),
+                    )
+                if neighbor in other_g and g_score[neighbor] + other_g[neighbor] < best:
+                    best = g_score[neighbor] + other_g[neighbor]
+                    meet = neighbor
+
+        if meet is None:
+            return []
+        path = []
+        node = meet
+        while node is not None:
+            path.append(node)
+            node = sides[0][2][node]
+        path.reverse()
+        node = sides[1][2][meet]
+        while node is not None:
+            path.append(node)
+            node = sides[1][2][node]
+        return path
+
+
+class JumpPointSearch(PathfindingAlgorithm):
+    """A* over jump points of a 4-connected grid.
+
+    From an expanded node the search runs straight on in each open direction
+    (except back) until the goal, a wall or a cell with an open side branch.
+    Cells skipped on the way only continue straight, so no shorter path is
+    lost, and in corridors only the junctions are expanded. The returned
+    path lists every cell, like the other algorithms.
+    """
+
+    open_jump_points: list = []
+
+    def frontier_size(self) -> int:
+        """Entries in the open set of jump points"""
+        return len(self.open_jump_points)
+
+    def jump(self, node, direction):
+        dx, dy = direction
+        grid = self.grid
+        x, y = node
+        while True:
+            x, y = x + dx, y + dy
+            if not (0 <= x < len(grid) and 0 <= y < len(grid[0])) or grid[x][y]:
+                return None
+            if (x, y) == self.goal:
+                return x, y
+            # A side branch (perpendicular open cell) makes this a jump point
+            for sx, sy in ((dy, dx), (-dy, -dx)):
+                nx, ny = x + sx, y + sy
+                if 0 <= nx < len(grid) and 0 <= ny < len(grid[0]) and not grid[nx][ny]:
+                    return x, y
+
+    def run(self) -> list[tuple[int, int]]:
+        tie = count()
+        h_score = self.heuristic_function(self.start, self.goal)
+        open_set = [(h_score, h_score, next(tie), self.start)]
+        self.open_jump_points = open_set
+        g_score = {self.start: 0}
+        closed = set()
+        while open_set:
+            current = heappop(open_set)[3]
+            if current == self.goal:
+                return self.reconstruct_path(current)
+            if current in closed:
+                continue
+            closed.add(current)
+            parent = self.came_from.get(current)
+            for neighbor in self.get_neighbors(current):
+                direction = (neighbor[0] - current[0], neighbor[1] - current[1])
+                if parent is not None and _step_towards(current, parent) == direction:
+                    continue
+                jump_point = self.jump(current, direction)
+                if jump_point is None:
+                    continue
+                tentative_g_score = (
+                    g_score[current]
+                    + abs(jump_point[0] - current[0])
+                    + abs(jump_point[1] - current[1])
+                )
+                if tentative_g_score < g_score.get(jump_point, float("inf")):
+                    g_score[jump_point] = tentative_g_score
+                    self.came_from[jump_point] = current
+                    h_score = self.heuristic_function(jump_point, self.goal)
+                    heappush(
+                        open_set,
+                        (tentative_g_score + h_score, h_score, next(tie), jump_point),
+                    )
+        return []
+
+    def reconstruct_path(self, current_node):
+        jump_points = super().reconstruct_path(current_node)
+        path = [jump_points[0]]
+        for node in jump_points[1:]:
+            step = _step_towards(path[-1], node)
+            while path[-1] != node:
+                path.append((path[-1][0] + step[0], path[-1][1] + step[1]))
+        return path
+
+
+def _step_towards(a: tuple[int, int], b: tuple[int, int]) -> tuple[int, int]:
+    return (b[0] > a[0]) - (b[0] < a[0]), (b[1] > a[1]) - (b[1] < a[1])
+
+
+# py_wanderer's algorithms followed by the ones above. py_wanderer's JPS is
+# plain A* under another name, so JumpPointSearch takes its place
+ALGORITHMS = [
+    *(a for a in py_wanderer.ALGORITHMS if a is not py_wanderer.JPS),
+    BidirectionalAStar,
+    JumpPointSearch,
+]
@@ -0,0 +1,171 @@
+from collections.abc import Iterator
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import to_hex
+
+from utils import MazePath
+
+# Same look as py_wanderer's matshow(cmap="gray"): open cells black, walls white
+FLOOR = (0, 0, 0)
+WALL = (255, 255, 255)
+START = (44, 160, 44)
+END = (214, 39, 40)
+PATH_COLORS = (np.array(colormaps["tab20"].colors) * 255).astype(np.uint8)
+TARGET_PIXELS = 800
+# Visit counts, log-scaled; the dark end of inferno is skipped to stand out
+# from the black floor
+HEAT_COLORS = (colormaps["inferno"](np.linspace(0.2, 1, 254))[:, :3] * 255).astype(
+    np.uint8
+)
+# Cells expanded by strategy A only, B only, and both
+DIFF_COLORS = np.array([(31, 119, 180), (255, 127, 14), (148, 103, 189)], np.uint8)
+DIFF_LABELS = ("Only A", "Only B", "Both")
+
+
+def path_color(i: int) -> np.ndarray:
+    return PATH_COLORS[(2 * i) % 20 + (2 * i) // 20 % 2]
+
+
+def path_cells(path: MazePath) -> tuple[np.ndarray, np.ndarray]:
+    """Row and column of every cell on the path, filling in straight jumps"""
+    points = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+    if len(points) < 2:
+        return points[:, 0], points[:, 1]
+    delta = np.diff(points, axis=0)
+    steps = np.maximum(np.abs(delta).max(axis=1), 1)
+    if (steps == 1).all():
+        return points[:, 0], points[:, 1]
+    segment = np.repeat(np.arange(len(delta)), steps)
+    offset = np.arange(segment.size) - np.repeat(np.cumsum(steps) - steps, steps)
+    cells = points[segment] + np.rint(
+        delta[segment] * (offset / steps[segment])[:, None]
+    ).astype(np.int64)
+    cells = np.vstack([cells, points[-1:]])
+    return cells[:, 0], cells[:, 1]
+
+
+def render_maze(
+    grid: np.ndarray,
+    paths: list[tuple[str, MazePath]],
+    start: tuple[int, int],
+    end: tuple[int, int],
+    scale: int | None = None,
+    overlay: tuple[np.ndarray, np.ndarray] | None = None,
+) -> np.ndarray:
+    """Maze and paths as an RGB uint8 image, `scale` pixels per cell.
+
+    `overlay` is a uint8 grid of codes into its colours (1 is the first, 0
+    leaves the cell alone) painted between the maze and the paths. Paths are
+    drawn last to first so the first strategy ends up on top.
+    """
+    grid = np.asarray(grid, dtype=np.uint8)
+    palette = np.array([FLOOR, WALL], dtype=np.uint8)
+    if overlay is not None:
+        codes, colors = overlay
+        palette = np.vstack([palette, colors])
+        grid = np.where(codes > 0, codes + 1, grid)
+    # np.take is much faster than fancy indexing for a palette lookup
+    image = np.take(palette, grid, axis=0)
+    for i in reversed(range(len(paths))):
+        rows, cols = path_cells(paths[i][1])
+        image[rows, cols] = path_color(i)
+    image[start] = START
+    image[end] = END
+
+    if scale is None:
+        scale = max(1, TARGET_PIXELS // max(grid.shape))
+    if scale > 1:
+        image = image.repeat(scale, axis=0).repeat(scale, axis=1)
+    return image
+
+
+def visit_counts(orders: list[np.ndarray], shape: tuple[int, int]) -> np.ndarray:
+    """Times each cell was expanded, summed over expansion orders"""
+    size = shape[0] * shape[1]
+    counts = sum(
+        (np.bincount(order, minlength=size) for order in orders),
+        np.zeros(size, dtype=np.int64),
+    )
+    return np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16).reshape(shape)
+
+
+def heat_overlay(counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    levels = np.log1p(counts, dtype=np.float32)
+    levels *= (len(HEAT_COLORS) - 1) / max(levels.max(), 1)
+    codes = levels.astype(np.uint8) + 1
+    codes[counts == 0] = 0
+    return codes, HEAT_COLORS
+
+
+def difference_overlay(
+    visited_a: np.ndarray, visited_b: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    codes = visited_a.astype(np.uint8) + 2 * visited_b.astype(np.uint8)
+    return codes, DIFF_COLORS
+
+
+def paint_cells(
+    image: np.ndarray, cells: np.ndarray, width: int, color: np.ndarray
+) -> None:
+    """Paint flat (row * width + col) cell indices in place on a scaled raster"""
+    scale = image.shape[1] // width
+    blocks = image.reshape(image.shape[0] // scale, scale, width, scale, 3)
+    rows, cols = np.divmod(cells, width)
+    blocks[rows, :, cols, :] = color
+
+
+def search_frames(
+    base: np.ndarray,
+    width: int,
+    order: np.ndarray,
+    path: MazePath,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    cells_per_frame: int,
+    color_index: int = 0,
+) -> Iterator[np.ndarray]:
+    """Frames of a search replayed on a copy of `base`.
+
+    Every frame paints only the cells expanded since the previous one onto
+    the same buffer, so the yielded array is reused and must be consumed
+    before the next frame. The last frame adds the path.
+    """
+    image = base.copy()
+    explored = path_color(color_index) // 2
+    terminals = np.array([start, end]) @ np.array([width, 1])
+    rows, cols = path_cells(path)
+    steps = [
+        (order[i : i + cells_per_frame], explored)
+        for i in range(0, len(order), cells_per_frame)
+    ]
+    for cells, color in steps + [(rows * width + cols, path_color(color_index))]:
+        paint_cells(image, cells, width, color)
+        paint_cells(image, terminals[:1], width, np.array(START))
+        paint_cells(image, terminals[1:], width, np.array(END))
+        yield image
+
+
+def swatches_html(entries: list[tuple[str, str]]) -> str:
+    """Inline colour swatches for (hex colour, label) pairs"""
+    return " ".join(
+        f'<span style="display:inline-block; margin-right:12px;">'
+        f'<span style="display:inline-block; width:12px; height:12px; '
+        f'background:{color}; margin-right:4px;"></span>{label}</span>'
+        for color, label in entries
+    )
+
+
+def legend_html(paths: list[tuple[str, MazePath]]) -> str:
+    entries = [
+        (
+            to_hex(path_color(i) / 255),
+            f"{name} ({len(path) - 1} steps)" if path else f"{name} (no path)",
+        )
+        for i, (name, path) in enumerate(paths)
+    ]
+    entries += [
+        (to_hex(np.array(START) / 255), "Start"),
+        (to_hex(np.array(END) / 255), "End"),
+    ]
+    return swatches_html(entries)
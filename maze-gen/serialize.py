@@ -0,0 +1,95 @@
+"""
+Binary maze format: a fixed header followed by the walls, one bit per cell.
+
+The header holds the grid size, start and end cells and the room settings,
+so a maze loads without regenerating it or knowing its MazeConfig. The bits
+can be zlib-compressed, and `to_url` / `from_url` turn a maze into URL-safe
+base64 for query params. A 1001x1001 maze is 125 KB uncompressed.
+"""
+
+import base64
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+from py_wanderer import Maze
+
+MAGIC = b"MAZE"
+VERSION = 1
+COMPRESSED = 1
+# magic, version, flags, height, width, start row/col, end row/col,
+# number of rooms, room size range
+HEADER = struct.Struct("<4sBBIIIIIIHHH")
+
+
+def dumps(maze: Maze, compress: bool = False) -> bytes:
+    grid = np.asarray(maze.maze, dtype=bool)
+    bits = np.packbits(grid).tobytes()
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        COMPRESSED if compress else 0,
+        *grid.shape,
+        *maze.start,
+        *maze.end,
+        maze.num_rooms,
+        *maze.room_size_range,
+    )
+    return header + (zlib.compress(bits, 6) if compress else bits)
+
+
+def loads_grid(data: bytes) -> tuple[np.ndarray, dict]:
+    """Walls as a uint8 grid, and the Maze arguments from the header"""
+    try:
+        magic, version, flags, height, width, *fields = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} maze file")
+        bits = data[HEADER.size :]
+        if flags & COMPRESSED:
+            bits = zlib.decompress(bits)
+    except (struct.error, zlib.error) as e:
+        raise ValueError(f"corrupt maze file: {e}") from e
+    if len(bits) != (height * width + 7) // 8:
+        raise ValueError("corrupt maze file: wrong number of cells")
+    grid = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=height * width)
+    start_row, start_col, end_row, end_col, num_rooms, min_room, max_room = fields
+    return grid.reshape(height, width), {
+        "width": width,
+        "height": height,
+        "start": (start_row, start_col),
+        "end": (end_row, end_col),
+        "num_rooms": num_rooms,
+        "room_size_range": (min_room, max_room),
+    }
+
+
+def loads(data: bytes) -> Maze:
+    grid, kwargs = loads_grid(data)
+    maze = Maze(**kwargs)
+    maze.maze = grid.tolist()
+    return maze
+
+
+def save(maze: Maze, path: Path, compress: bool = True) -> None:
+    Path(path).write_bytes(dumps(maze, compress))
+
+
+def load(path: Path) -> Maze:
+    return loads(Path(path).read_bytes())
+
+
+def encode_url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def to_url(maze: Maze) -> str:
+    return encode_url(dumps(maze, compress=True))
+
+
+def decode_url(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def from_url(text: str) -> Maze:
+    return loads(decode_url(text))
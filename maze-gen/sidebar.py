@@ -3,7 +3,9 @@ from matplotlib.figure import Figure
 from py_wanderer import ALGORITHMS, HEURISTICS
 from py_wanderer.plotter import plot_maze_with_paths
 
-from utils import generate_maze, solve_maze, MazeConfig
+from figure_cache import figure_cache
+from maze_cache import maze_cache, maze_key
+from utils import MazeConfig
 
 
 def configure_page() -> None:
@@ -47,14 +49,8 @@ def configure_sidebar() -> MazeConfig:
 
 
 def create_plot(maze_config: MazeConfig) -> Figure:
-    maze = generate_maze(
-        maze_config.seed,
-        maze_config.width,
-        maze_config.height,
-        maze_config.num_rooms,
-        maze_config.room_size_range,
-    )
-    paths = solve_maze(maze, ((ALGORITHMS[0], HEURISTICS[0]),))
+    maze = maze_cache.get_maze(maze_config)
+    paths = maze_cache.get_paths(maze_config, maze, ((ALGORITHMS[0], HEURISTICS[0]),))
     fig = plot_maze_with_paths(maze, paths)
     return fig
 
@@ -64,8 +60,7 @@ def main() -> None:
     configure_overview()
     configure_available_algo_heuristics()
     maze_config = configure_sidebar()
-    fig = create_plot(maze_config)
-    st.pyplot(fig)
+    st.image(figure_cache.png(maze_key(maze_config), create_plot, maze_config))
 
 
 if __name__ == "__main__":
@@ -1,16 +1,60 @@
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
+from matplotlib.colors import to_hex
 from matplotlib.figure import Figure
-from py_wanderer import ALGORITHMS, HEURISTICS
+from py_wanderer import HEURISTICS, Heuristic, Maze
 from py_wanderer.plotter import plot_maze_with_paths
 
+import serialize
+from figure_cache import figure_cache
+from hpa import DEFAULT_CLUSTER_SIZE, AbstractGraph, HPAResult
+from incremental import LPAStar, consistent_heuristic
+from instrumentation import SearchCounters, solve_many
+from landmarks import DEFAULT_LANDMARKS, LandmarkHeuristic, alt, with_landmarks
+from maze_cache import maze_cache, maze_key, strategy_name
+from pathfinding import ALGORITHMS
+from render import (
+    DIFF_COLORS,
+    DIFF_LABELS,
+    difference_overlay,
+    heat_overlay,
+    legend_html,
+    render_maze,
+    search_frames,
+    swatches_html,
+    visit_counts,
+)
+from solvers import (
+    BackgroundSolve,
+    SolveJob,
+    StrategyResult,
+    make_executor,
+    run_strategy,
+    solve_seed,
+)
 from utils import (
-    generate_maze,
-    solve_maze,
+    GENERATORS,
     MazeConfig,
+    MazePath,
     SolvingStrategy,
     SolvingStrategies,
+    maze_to_grid,
+    shortest_path_length,
 )
 
+# Generator name of uploaded and linked mazes: only ever read from the cache
+SHARED_GENERATOR = "shared"
+MAX_LINK_LENGTH = 8000
+# Seconds between progress checks of a background solve
+PROGRESS_INTERVAL_S = 0.5
+
 
 def configure_page() -> None:
     st.set_page_config(page_title="Maze and Pathfinding Visualizer", layout="wide")
@@ -39,12 +83,20 @@ def configure_available_algo_heuristics() -> None:
         right.markdown("### Heuristics")
         for heuristic in HEURISTICS:
             right.markdown(f"- {heuristic.__name__.title()}")
+        right.markdown("- ALT (landmark distances, precomputed per maze)")
 
 
 def configure_sidebar() -> MazeConfig:
     seed = st.sidebar.number_input("Seed", 0, 10, 0)
-    width = st.sidebar.slider("Width", 5, 101, 11)
-    height = st.sidebar.slider("Height", 5, 101, 11)
+    generator = st.sidebar.selectbox(
+        "Generator",
+        list(GENERATORS),
+        format_func=str.title,
+        help="Kruskal builds the maze as a NumPy grid and handles up to 2001x2001.",
+    )
+    max_size = 2001 if generator == "kruskal" else 101
+    width = st.sidebar.slider("Width", 5, max_size, 11)
+    height = st.sidebar.slider("Height", 5, max_size, 11)
     num_rooms = st.sidebar.slider("Number of rooms", 0, 5, 0)
     room_size_range = st.sidebar.slider(
         "Room size range", 1, min(width, height) // 4, (3, 6)
@@ -58,9 +110,9 @@ def configure_sidebar() -> MazeConfig:
     )
     heuristics_multiselect = st.sidebar.multiselect(
         "Select heuristics",
-        HEURISTICS,
+        [*HEURISTICS, alt],
         [HEURISTICS[0]],
-        format_func=lambda x: x.__name__.title(),
+        format_func=lambda x: "ALT" if x is alt else x.__name__.title(),
     )
     solving_strategies: SolvingStrategies = tuple(
         (algorithm, heuristic)
@@ -69,30 +121,652 @@ def configure_sidebar() -> MazeConfig:
     )
 
     return MazeConfig(
-        seed, width, height, num_rooms, room_size_range, solving_strategies
+        seed, width, height, num_rooms, room_size_range, solving_strategies, generator
+    )
+
+
+def load_shared_maze(maze_config: MazeConfig) -> MazeConfig:
+    """Config of an uploaded or linked (`?maze=...`) maze, if there is one.
+
+    The maze is put in the maze cache under a config keyed by its contents,
+    so solving and caching work as for generated mazes.
+    """
+    uploaded = st.sidebar.file_uploader("Load maze file", type="maze")
+    if uploaded is None and "maze" not in st.query_params:
+        return maze_config
+    if uploaded is None and st.sidebar.button("Back to generated maze"):
+        del st.query_params["maze"]
+        st.rerun()
+    try:
+        if uploaded is not None:
+            data = uploaded.getvalue()
+        else:
+            data = serialize.decode_url(st.query_params["maze"])
+        maze = serialize.loads(data)
+    except ValueError as e:
+        st.sidebar.error(f"Could not load the maze: {e}")
+        return maze_config
+
+    shared_config = replace(
+        maze_config,
+        seed=int.from_bytes(hashlib.sha1(data).digest()[:8]),
+        width=maze.width,
+        height=maze.height,
+        num_rooms=maze.num_rooms,
+        room_size_range=maze.room_size_range,
+        generator=SHARED_GENERATOR,
     )
+    maze_cache.put_maze(shared_config, maze)
+    st.sidebar.info(f"Showing a loaded {maze.width}x{maze.height} maze.")
+    return shared_config
+
+
+@st.cache_data(max_entries=8)
+def maze_file(_maze: Maze, key: tuple) -> bytes:
+    return serialize.dumps(_maze, compress=True)
+
+
+def configure_sharing(maze_config: MazeConfig, maze: Maze) -> None:
+    with st.sidebar.expander("Save and share"):
+        data = maze_file(maze, maze_key(maze_config))
+        st.download_button("Download maze", data, "maze.maze")
+        link = serialize.encode_url(data)
+        if len(link) > MAX_LINK_LENGTH:
+            st.caption("Too large to share as a link: share the file instead.")
+        elif st.button("Share as link", help="Puts the maze in the page URL."):
+            st.query_params["maze"] = link
+
+
+def configure_landmarks(maze_config: MazeConfig) -> int | None:
+    if not any(h is alt for _, h in maze_config.solving_strategies):
+        return None
+    return st.sidebar.slider(
+        "Landmarks",
+        1,
+        16,
+        DEFAULT_LANDMARKS,
+        help="ALT precomputes a BFS distance field from each landmark. More "
+        "landmarks give tighter estimates but take longer to build.",
+    )
+
+
+@st.cache_resource(max_entries=4)
+def landmark_heuristic(
+    _maze: Maze, key: tuple, num_landmarks: int
+) -> LandmarkHeuristic:
+    return LandmarkHeuristic(maze_to_grid(_maze), _maze.start, num_landmarks)
+
+
+def resolve_landmarks(
+    maze_config: MazeConfig, maze: Maze, num_landmarks: int | None
+) -> MazeConfig:
+    if num_landmarks is None:
+        return maze_config
+    with st.spinner("Computing landmark distances"):
+        heuristic = landmark_heuristic(maze, maze_key(maze_config), num_landmarks)
+    return replace(
+        maze_config,
+        solving_strategies=with_landmarks(maze_config.solving_strategies, heuristic),
+    )
+
+
+def configure_solving_mode() -> bool:
+    return st.sidebar.toggle(
+        "Solve in parallel with timings",
+        help="Run every strategy in a worker process and report time, "
+        "expanded nodes and path length.",
+    )
+
+
+def configure_seed_comparison() -> int | None:
+    """Number of seeds to compare over, or None when off"""
+    if not st.sidebar.toggle(
+        "Compare over seeds",
+        help="Run every strategy on mazes from consecutive seeds, in worker "
+        "processes, and plot the spread of the results.",
+    ):
+        return None
+    return st.sidebar.slider("Seeds to compare", 2, 100, 20)
 
 
-def create_plot(maze_config: MazeConfig) -> Figure:
-    maze = generate_maze(
-        maze_config.seed,
-        maze_config.width,
-        maze_config.height,
-        maze_config.num_rooms,
-        maze_config.room_size_range,
+def seed_box_plot(df: pd.DataFrame, column: str, log_y: bool) -> go.Figure:
+    fig = go.Figure(
+        [
+            go.Box(y=group[column], name=strategy, boxpoints="all", jitter=0.3)
+            for strategy, group in df.groupby("Strategy", sort=False)
+        ]
     )
-    paths = solve_maze(maze, maze_config.solving_strategies)
+    fig.update_layout(
+        yaxis_title=column,
+        yaxis_type="log" if log_y else "linear",
+        showlegend=False,
+        height=450,
+    )
+    return fig
+
+
+def compare_seeds(
+    maze_config: MazeConfig, num_seeds: int, num_landmarks: int | None
+) -> None:
+    st.markdown("## Seed comparison")
+    if maze_config.generator == SHARED_GENERATOR:
+        st.info("A loaded maze has no seed to vary.")
+        return
+
+    key = (maze_config, num_seeds, num_landmarks)
+    previous = st.session_state.get("seed_jobs")
+    if previous is not None and previous[0] == key:
+        futures = previous[1]
+    else:
+        if previous is not None:
+            for future in previous[1]:
+                future.cancel()
+        futures = [
+            get_executor().submit(
+                solve_seed,
+                replace(maze_config, seed=maze_config.seed + k),
+                num_landmarks,
+            )
+            for k in range(num_seeds)
+        ]
+        st.session_state["seed_jobs"] = (key, futures)
+
+    progress = st.progress(0.0)
+    log_y = st.toggle("Log scale", value=True, key="seed_log_scale")
+    left, right = st.columns(2)
+    expanded_chart, time_chart = left.empty(), right.empty()
+    medians = st.empty()
+    rows = []
+    for done, future in enumerate(as_completed(futures), 1):
+        seed, results = future.result()
+        rows += [{"Seed": seed, **r.as_row()} for r in results]
+        df = pd.DataFrame(rows)
+        progress.progress(done / num_seeds, f"{done}/{num_seeds} seeds")
+        expanded_chart.plotly_chart(
+            seed_box_plot(df, "Expanded nodes", log_y), use_container_width=True
+        )
+        time_chart.plotly_chart(
+            seed_box_plot(df, "Wall time (ms)", log_y), use_container_width=True
+        )
+        medians.dataframe(
+            df.groupby("Strategy", sort=False)[
+                ["Path length", "Expanded nodes", "Wall time (ms)"]
+            ]
+            .median()
+            .add_prefix("Median "),
+        )
+    progress.empty()
+
+
+def configure_counters() -> bool:
+    return st.sidebar.toggle(
+        "Search counters",
+        help="Count expanded nodes, peak frontier size and heuristic "
+        "evaluations for every strategy.",
+    )
+
+
+def show_counters(counters: list[SearchCounters]) -> None:
+    st.markdown("## Search counters")
+    df = pd.DataFrame([c.as_row() for c in counters])
+    st.dataframe(df, hide_index=True)
+    metric = st.selectbox("Compare", df.columns[1:])
+    st.bar_chart(df, x="Strategy", y=metric, horizontal=True)
+    st.caption(
+        "Peak frontier is empty for DFS, Swarm, IDDFS and Bellman-Ford, which "
+        "keep a frontier of their own that is not exposed."
+    )
+
+
+@st.cache_resource
+def get_executor() -> ProcessPoolExecutor:
+    return make_executor()
+
+
+def solve_with_timings(maze_config: MazeConfig) -> list[StrategyResult]:
+    maze = maze_cache.get_maze(maze_config)
+    previous = st.session_state.get("solve_job")
+    if previous is not None and previous[0] == maze_config:
+        job = previous[1]
+    else:
+        if previous is not None:
+            # Sidebar changed: the old job's pending strategies are stale
+            previous[1].cancel()
+        job = SolveJob(get_executor(), maze, maze_config.solving_strategies)
+        st.session_state["solve_job"] = (maze_config, job)
+
+    st.markdown("## Strategy results")
+    table = st.empty()
+    order = {future: i for i, future in enumerate(job.futures)}
+    results: dict[int, StrategyResult] = {}
+    for future in as_completed(job.futures):
+        results[order[future]] = future.result()
+        table.dataframe(
+            pd.DataFrame([results[i].as_row() for i in sorted(results)]),
+            hide_index=True,
+        )
+    return [results[i] for i in sorted(results)]
+
+
+def solve_in_background(
+    maze_config: MazeConfig, maze: Maze
+) -> list[tuple[str, MazePath]]:
+    """Paths solved so far; the others are solved in a background thread.
+
+    A changed config cancels the previous job at its next expansion. Each
+    finished strategy goes to the maze cache and reruns the page, so paths
+    appear one by one.
+    """
+    previous = st.session_state.get("background_solve")
+    if previous is not None and previous[0] != maze_config:
+        previous[1].cancel()
+        del st.session_state["background_solve"]
+        previous = None
+
+    strategies = maze_config.solving_strategies
+    cached = {s: maze_cache.get_path(maze_config, s) for s in strategies}
+    missing = [s for s in strategies if cached[s] is None]
+    if missing and previous is None:
+        job = BackgroundSolve(
+            maze,
+            missing,
+            on_result=lambda s, result: maze_cache.put_path(
+                maze_config, s, result.path
+            ),
+        )
+        st.session_state["background_solve"] = (maze_config, job)
+    elif previous is not None:
+        job = previous[1]
+
+    if missing:
+        # Taken before the paths, so no result can be missed by both
+        seen = len(job.results)
+        solved = {result.name: result.path for result in job.results[:seen]}
+        for strategy in missing:
+            cached[strategy] = solved.get(strategy_name(strategy))
+        if job.error is not None:
+            st.error(f"Solving failed: {job.error!r}")
+        elif seen < len(job.strategies):
+            show_background_progress(job, seen)
+    return [(strategy_name(s), cached[s]) for s in strategies if cached[s] is not None]
+
+
+@st.fragment(run_every=PROGRESS_INTERVAL_S)
+def show_background_progress(job: BackgroundSolve, seen: int) -> None:
+    if len(job.results) > seen or job.done():
+        st.rerun()
+    st.progress(
+        seen / len(job.strategies),
+        text=f"Solved {seen} of {len(job.strategies)} strategies, "
+        f"running {job.running}",
+    )
+
+
+def configure_renderer() -> str:
+    return st.sidebar.radio(
+        "Renderer",
+        ["raster", "matplotlib"],
+        format_func=str.title,
+        horizontal=True,
+        help="Raster composes the maze and paths into one image: fast for big mazes.",
+    )
+
+
+def configure_animation() -> tuple[int, int] | None:
+    """Cells painted per frame and frames per second, or None when off"""
+    if not st.sidebar.toggle(
+        "Animate search",
+        help="Replay the cells each strategy expands, in order.",
+    ):
+        return None
+    cells_per_frame = st.sidebar.select_slider(
+        "Cells per frame", [1, 2, 5, 10, 25, 50, 100, 250, 1000], 10
+    )
+    fps = st.sidebar.slider("Frames per second", 1, 60, 20)
+    return cells_per_frame, fps
+
+
+def expansion_results(
+    maze_config: MazeConfig, maze: Maze
+) -> tuple[np.ndarray, list[StrategyResult]]:
+    """Base raster and recorded expansion orders, kept for the current maze"""
+    cached = st.session_state.get("expansion_results")
+    if cached is None or cached[0] != maze_config:
+        grid = maze_to_grid(maze)
+        base = render_maze(grid, [], maze.start, maze.end)
+        results = [
+            run_strategy(grid.tolist(), maze.start, maze.end, s, record_order=True)
+            for s in maze_config.solving_strategies
+        ]
+        cached = (maze_config, base, results)
+        st.session_state["expansion_results"] = cached
+    return cached[1], cached[2]
+
+
+def animate_search(
+    maze_config: MazeConfig, maze: Maze, cells_per_frame: int, fps: int
+) -> None:
+    st.markdown("## Search animation")
+    base, results = expansion_results(maze_config, maze)
+    if not results:
+        return
+    index = st.selectbox(
+        "Strategy",
+        range(len(results)),
+        format_func=lambda i: f"{results[i].name} "
+        f"({results[i].expanded_nodes} expanded)",
+    )
+    if not st.button("Play"):
+        return
+
+    result = results[index]
+    frame = st.empty()
+    width = len(maze.maze[0])
+    for image in search_frames(
+        base,
+        width,
+        result.expansion_order,
+        result.path,
+        maze.start,
+        maze.end,
+        cells_per_frame,
+        index,
+    ):
+        frame.image(image)
+        time.sleep(1 / fps)
+
+
+def configure_hpa() -> int | None:
+    """Cluster size of hierarchical pathfinding, or None when off"""
+    if not st.sidebar.toggle(
+        "Hierarchical (HPA*)",
+        help="Search an abstract graph of cluster entrances, precomputed per "
+        "maze, then refine the route inside each cluster. Fast on huge mazes, "
+        "not always shortest.",
+    ):
+        return None
+    return st.sidebar.select_slider(
+        "Cluster size", [8, 16, 32, 64, 128], DEFAULT_CLUSTER_SIZE
+    )
+
+
+@st.cache_resource(max_entries=4)
+def abstract_graph(_maze: Maze, key: tuple, cluster_size: int) -> AbstractGraph:
+    return AbstractGraph(maze_to_grid(_maze), cluster_size)
+
+
+# Both take seconds on the largest mazes: cached, like the abstract graph
+@st.cache_data(max_entries=4)
+def hpa_path(_maze: Maze, key: tuple, cluster_size: int) -> HPAResult:
+    graph = abstract_graph(_maze, key, cluster_size)
+    return graph.find_path(_maze.start, _maze.end)
+
+
+@st.cache_data(max_entries=4)
+def exact_path_length(_maze: Maze, key: tuple) -> int | None:
+    return shortest_path_length(_maze.maze, _maze.start, _maze.end)
+
+
+def solve_hpa(
+    maze_config: MazeConfig,
+    maze: Maze,
+    cluster_size: int,
+    paths: list[tuple[str, MazePath]],
+) -> tuple[str, MazePath]:
+    """HPA* path, compared with the other strategies' paths"""
+    st.markdown("## Hierarchical pathfinding")
+    key = maze_key(maze_config)
+    with st.spinner("Building the abstract graph"):
+        graph = abstract_graph(maze, key, cluster_size)
+    result = hpa_path(maze, key, cluster_size)
+    label = f"HPA* (cluster {cluster_size})"
+    shortest = exact_path_length(maze, key)
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "Strategy": name,
+                    "Path length": len(path) - 1 if path else None,
+                    "Excess over shortest (%)": (
+                        round(100 * ((len(path) - 1) / shortest - 1), 2)
+                        if path and shortest
+                        else None
+                    ),
+                }
+                for name, path in [*paths, (label, result.path)]
+            ]
+        ),
+        hide_index=True,
+    )
+    st.caption(
+        f"Abstract graph: {graph.num_nodes} entrance cells, built in "
+        f"{graph.build_time_s:.2f} s. Query: {result.abstract_expanded} abstract "
+        f"nodes expanded in {result.time_s * 1000:.1f} ms."
+    )
+    return label, result.path
+
+
+def configure_exploration() -> bool:
+    return st.sidebar.toggle(
+        "Exploration overlay",
+        help="Show where strategies expanded nodes: visit counts, or the cells "
+        "one strategy expanded and another did not.",
+    )
+
+
+def show_exploration(maze_config: MazeConfig, maze: Maze) -> None:
+    st.markdown("## Exploration")
+    _, results = expansion_results(maze_config, maze)
+    if not results:
+        return
+    grid = maze_to_grid(maze)
+    names = [r.name for r in results]
+    mode = st.radio("Overlay", ["Visit counts", "Difference"], horizontal=True)
+    if mode == "Visit counts":
+        chosen = st.multiselect(
+            "Strategies to sum",
+            range(len(results)),
+            list(range(len(results))),
+            format_func=names.__getitem__,
+        )
+        counts = visit_counts([results[i].expansion_order for i in chosen], grid.shape)
+        overlay = heat_overlay(counts)
+        legend = "Expansions per cell, log scale: dark purple few, yellow most."
+    else:
+        if len(results) < 2:
+            st.info("Select at least two strategies to compare.")
+            return
+        left, right = st.columns(2)
+        a = left.selectbox("Strategy A", range(len(results)), 0, names.__getitem__)
+        b = right.selectbox("Strategy B", range(len(results)), 1, names.__getitem__)
+        chosen = [a, b]
+        visited_a, visited_b = (
+            visit_counts([results[i].expansion_order], grid.shape) > 0 for i in chosen
+        )
+        overlay = difference_overlay(visited_a, visited_b)
+        cells = (
+            (visited_a & ~visited_b).sum(),
+            (visited_b & ~visited_a).sum(),
+            (visited_a & visited_b).sum(),
+        )
+        legend = swatches_html(
+            [
+                (to_hex(color / 255), f"{label} ({n} cells)")
+                for color, label, n in zip(DIFF_COLORS, DIFF_LABELS, cells)
+            ]
+        )
+
+    paths = [(names[i], results[i].path) for i in chosen]
+    st.image(render_maze(grid, paths, maze.start, maze.end, overlay=overlay))
+    st.markdown(legend, unsafe_allow_html=True)
+    st.markdown(legend_html(paths), unsafe_allow_html=True)
+
+
+def configure_wall_editing() -> bool:
+    return st.sidebar.toggle(
+        "Edit walls",
+        help="Toggle walls and re-plan incrementally with LPA*, one planner per "
+        "selected heuristic.",
+    )
+
+
+def selected_heuristics(maze_config: MazeConfig) -> list[Heuristic]:
+    """Heuristics of the strategies, ALT left out, in order and without repeats"""
+    heuristics = []
+    for _, h in maze_config.solving_strategies:
+        if not isinstance(h, LandmarkHeuristic) and h not in heuristics:
+            heuristics.append(h)
+    return heuristics
+
+
+def wall_planners(maze_config: MazeConfig, maze: Maze) -> dict[str, LPAStar]:
+    """LPA* planners of the current maze, kept with their edits in session state.
+
+    ALT is left out: its landmark distances are those of the unedited maze,
+    and overestimate once a wall is removed. Heuristics LPA* cannot plan with
+    share the Manhattan planner.
+    """
+    heuristics = {
+        h.__name__: h
+        for h in map(consistent_heuristic, selected_heuristics(maze_config))
+    }
+    key = (maze_key(maze_config), tuple(heuristics))
+    state = st.session_state.get("wall_planners")
+    if state is None or state[0] != key:
+        planners = {}
+        for name, heuristic in heuristics.items():
+            planner = LPAStar(maze.maze, maze.start, maze.end, heuristic)
+            t0 = time.perf_counter()
+            expanded = planner.compute_shortest_path()
+            planner.last_repair = (expanded, time.perf_counter() - t0)
+            planners[name] = planner
+        state = (key, planners)
+        st.session_state["wall_planners"] = state
+    return state[1]
+
+
+def edit_walls(maze_config: MazeConfig, maze: Maze) -> None:
+    st.markdown("## Wall editing")
+    if any(isinstance(h, LandmarkHeuristic) for _, h in maze_config.solving_strategies):
+        st.caption(
+            "ALT is not re-planned: its landmark distances are only valid for "
+            "the unedited maze."
+        )
+    replaced = [
+        h.__name__.title()
+        for h in selected_heuristics(maze_config)
+        if consistent_heuristic(h) is not h
+    ]
+    if replaced:
+        st.caption(
+            f"{', '.join(replaced)} can drop by more than one per step, which LPA* "
+            "cannot plan with: Manhattan is used instead."
+        )
+    planners = wall_planners(maze_config, maze)
+    if not planners:
+        return
+    with st.form("toggle_wall"):
+        left, right = st.columns(2)
+        row = left.number_input("Row", 1, maze.height - 2, maze.height // 2)
+        col = right.number_input("Column", 1, maze.width - 2, maze.width // 2)
+        toggled = st.form_submit_button("Toggle wall")
+    if toggled:
+        if (row, col) in (maze.start, maze.end):
+            st.warning("Start and end cannot be walls.")
+        else:
+            for planner in planners.values():
+                t0 = time.perf_counter()
+                planner.toggle_wall((row, col))
+                expanded = planner.compute_shortest_path()
+                planner.last_repair = (expanded, time.perf_counter() - t0)
+
+    grid = np.asarray(next(iter(planners.values())).grid, dtype=np.uint8)
+    paths = [(f"LPA*: {name}", planner.path()) for name, planner in planners.items()]
+    st.dataframe(
+        pd.DataFrame(
+            [
+                {
+                    "Planner": label,
+                    "Path length": len(path) - 1 if path else None,
+                    "Last search expanded": planner.last_repair[0],
+                    "Last search (ms)": round(planner.last_repair[1] * 1000, 2),
+                    "Total expanded": planner.expanded_nodes,
+                }
+                for (label, path), planner in zip(paths, planners.values())
+            ]
+        ),
+        hide_index=True,
+    )
+    st.image(render_maze(grid, paths, maze.start, maze.end))
+    st.markdown(legend_html(paths), unsafe_allow_html=True)
+
+
+def create_plot(maze: Maze, paths: list[tuple[str, MazePath]]) -> Figure:
     fig = plot_maze_with_paths(maze, paths)
     return fig
 
 
+def plot_png(
+    maze_config: MazeConfig, maze: Maze, paths: list[tuple[str, MazePath]]
+) -> bytes:
+    # Paths are part of the key: they depend on more than the maze config
+    key = (maze_key(maze_config), [(label, tuple(path)) for label, path in paths])
+    return figure_cache.png(key, create_plot, maze, paths)
+
+
+def show_figure_cache() -> None:
+    st.sidebar.caption(f"Figure cache: {figure_cache.stats().summary()}")
+
+
+def show_raster(maze: Maze, paths: list[tuple[str, MazePath]]) -> None:
+    image = render_maze(maze_to_grid(maze), paths, maze.start, maze.end)
+    st.image(image)
+    st.markdown(legend_html(paths), unsafe_allow_html=True)
+
+
 def main() -> None:
     configure_page()
     configure_overview()
     configure_available_algo_heuristics()
-    maze_config = configure_sidebar()
-    fig = create_plot(maze_config)
-    st.pyplot(fig)
+    maze_config = load_shared_maze(configure_sidebar())
+    num_landmarks = configure_landmarks(maze_config)
+    renderer = configure_renderer()
+    animation = configure_animation()
+    exploration = configure_exploration()
+    cluster_size = configure_hpa()
+    editing = configure_wall_editing()
+    num_seeds = configure_seed_comparison()
+    maze = maze_cache.get_maze(maze_config)
+    configure_sharing(maze_config, maze)
+    # Other seeds are other mazes: they need their own landmarks
+    seeds_config = maze_config
+    maze_config = resolve_landmarks(maze_config, maze, num_landmarks)
+    parallel = configure_solving_mode()
+    counted = configure_counters()
+    if counted:
+        counted_paths, counters = solve_many(maze, maze_config.solving_strategies)
+        show_counters(counters)
+    if parallel:
+        paths = [(r.name, r.path) for r in solve_with_timings(maze_config)]
+    elif counted:
+        paths = counted_paths
+    else:
+        paths = solve_in_background(maze_config, maze)
+    if cluster_size is not None:
+        paths = [*paths, solve_hpa(maze_config, maze, cluster_size, paths)]
+    if renderer == "raster":
+        show_raster(maze, paths)
+    else:
+        st.image(plot_png(maze_config, maze, paths))
+        show_figure_cache()
+    if animation is not None:
+        animate_search(maze_config, maze, *animation)
+    if exploration:
+        show_exploration(maze_config, maze)
+    if editing:
+        edit_walls(maze_config, maze)
+    if num_seeds is not None:
+        compare_seeds(seeds_config, num_seeds, num_landmarks)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ from matplotlib.figure import Figure
 from py_wanderer import ALGORITHMS, HEURISTICS
 from py_wanderer.plotter import plot_maze_with_paths
 
+from figure_cache import figure_cache
 from utils import generate_maze, solve_maze, MazeConfig
 
 
@@ -55,8 +56,7 @@ def main() -> None:
     configure_page()
     configure_overview()
     configure_available_algo_heuristics()
-    fig = create_plot(maze_config)
-    st.pyplot(fig)
+    st.image(figure_cache.png(maze_config, create_plot, maze_config))
 
 
 if __name__ == "__main__":
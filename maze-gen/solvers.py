@@ -0,0 +1,315 @@
+import multiprocessing
+import os
+import threading
+from array import array
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from time import perf_counter
+
+import numpy as np
+from py_wanderer import Maze
+
+from landmarks import LandmarkHeuristic, with_landmarks
+from maze_cache import strategy_name
+from utils import (
+    MazeConfig,
+    MazePath,
+    SolvingStrategies,
+    SolvingStrategy,
+    build_maze,
+    maze_to_grid,
+)
+
+
+class SolveCancelled(Exception):
+    """Raised inside a search whose job was cancelled"""
+
+
+@dataclass
+class StrategyResult:
+    name: str
+    path: MazePath
+    wall_time: float
+    expanded_nodes: int
+    # Flat (row * width + col) index of every expanded cell, in order
+    expansion_order: np.ndarray | None = None
+
+    @property
+    def path_length(self) -> int | None:
+        return len(self.path) - 1 if self.path else None
+
+    def as_row(self) -> dict:
+        return {
+            "Strategy": self.name,
+            "Path length": self.path_length,
+            "Expanded nodes": self.expanded_nodes,
+            "Wall time (ms)": round(self.wall_time * 1000, 2),
+        }
+
+
+class ExpansionCounter:
+    """Wraps a pathfinder's get_neighbors, called once per expanded node.
+
+    Counts expansions, and optionally records the flat index of each expanded
+    cell or the peak of a `frontier` size. Once `cancel` is set, the search
+    raises SolveCancelled at its next expansion.
+    """
+
+    def __init__(
+        self,
+        pathfinder,
+        cancel: threading.Event | None = None,
+        record_order: bool = False,
+        frontier: Callable[[], int] | None = None,
+    ):
+        self.expanded = 0
+        self.order = array("i") if record_order else None
+        self.peak_frontier = 0
+        get_neighbors = pathfinder.get_neighbors
+        width = len(pathfinder.grid[0])
+        order = self.order
+
+        def counted_get_neighbors(node):
+            if cancel is not None and cancel.is_set():
+                raise SolveCancelled
+            self.expanded += 1
+            if order is not None:
+                order.append(node[0] * width + node[1])
+            if frontier is not None:
+                self.peak_frontier = max(self.peak_frontier, frontier())
+            return get_neighbors(node)
+
+        pathfinder.get_neighbors = counted_get_neighbors
+
+
+def run_strategy(
+    grid: list[list[int]],
+    start: tuple[int, int],
+    end: tuple[int, int],
+    strategy: SolvingStrategy,
+    record_order: bool = False,
+    cancel: threading.Event | None = None,
+) -> StrategyResult:
+    """Solve with one strategy, counting expansions (one get_neighbors per node).
+
+    Once `cancel` is set, the search raises SolveCancelled at its next expansion.
+    """
+    algorithm, heuristic = strategy
+    pathfinder = algorithm(grid, start, end, heuristic)
+    counter = ExpansionCounter(pathfinder, cancel, record_order)
+    t0 = perf_counter()
+    path = pathfinder.run()
+    elapsed = perf_counter() - t0
+    return StrategyResult(
+        strategy_name(strategy),
+        path,
+        elapsed,
+        counter.expanded,
+        None if counter.order is None else np.frombuffer(counter.order, np.int32),
+    )
+
+
+@dataclass(frozen=True)
+class SharedLandmarks:
+    """A LandmarkHeuristic sent to workers: its distance fields are in shared
+    memory, only this small description is pickled with each task."""
+
+    shm_name: str
+    shape: tuple[int, int]
+    name: str
+    width: int
+    landmarks: list[tuple[int, int]]
+
+
+def _share(values: np.ndarray) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+    return shm
+
+
+def _read_shared(shm_name: str, shape: tuple[int, ...], dtype) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+
+
+# Worker side: the grid and landmarks of the current job, read once per process
+_worker_grid: dict[str, list[list[int]]] = {}
+_worker_heuristics: dict[str, LandmarkHeuristic] = {}
+
+
+def _solve_shared(
+    shm_name: str,
+    shape: tuple[int, int],
+    start: tuple[int, int],
+    end: tuple[int, int],
+    strategy: SolvingStrategy,
+) -> StrategyResult:
+    if shm_name not in _worker_grid:
+        _worker_grid.clear()
+        _worker_grid[shm_name] = _read_shared(shm_name, shape, np.uint8).tolist()
+    algorithm, heuristic = strategy
+    if isinstance(heuristic, SharedLandmarks):
+        shared = heuristic
+        if shared.shm_name not in _worker_heuristics:
+            _worker_heuristics.clear()
+            _worker_heuristics[shared.shm_name] = LandmarkHeuristic.from_fields(
+                shared.name,
+                shared.width,
+                shared.landmarks,
+                _read_shared(shared.shm_name, shared.shape, np.int32),
+            )
+        strategy = (algorithm, _worker_heuristics[shared.shm_name])
+    return run_strategy(_worker_grid[shm_name], start, end, strategy)
+
+
+class SolveJob:
+    """Strategies of one maze solved in a process pool.
+
+    The maze grid and the landmark fields of ALT heuristics are put in shared
+    memory once and read by every worker. `cancel` drops the jobs that have
+    not started yet; the shared memory is freed once every job has finished
+    or been cancelled, since a started job may still have to attach to it.
+    """
+
+    def __init__(
+        self, executor: ProcessPoolExecutor, maze: Maze, strategies: SolvingStrategies
+    ):
+        grid = np.asarray(maze.maze, dtype=np.uint8)
+        self._shms = [_share(grid)]
+        shared: dict[int, SharedLandmarks] = {}
+        tasks = []
+        for algorithm, heuristic in strategies:
+            if isinstance(heuristic, LandmarkHeuristic):
+                if id(heuristic) not in shared:
+                    self._shms.append(_share(heuristic.fields))
+                    shared[id(heuristic)] = SharedLandmarks(
+                        self._shms[-1].name,
+                        heuristic.fields.shape,
+                        heuristic.__name__,
+                        heuristic.width,
+                        heuristic.landmarks,
+                    )
+                heuristic = shared[id(heuristic)]
+            tasks.append((algorithm, heuristic))
+
+        self.futures: list[Future] = [
+            executor.submit(
+                _solve_shared, self._shms[0].name, grid.shape, maze.start, maze.end, s
+            )
+            for s in tasks
+        ]
+        self._pending = len(self.futures)
+        self._lock = threading.Lock()
+        if not self.futures:
+            self._release()
+        for future in self.futures:
+            future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if self._pending:
+                return
+        self._release()
+
+    def _release(self) -> None:
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+
+    def done(self) -> bool:
+        return all(f.done() for f in self.futures)
+
+    def cancel(self) -> None:
+        for future in self.futures:
+            future.cancel()
+
+
+class BackgroundSolve:
+    """Strategies of one maze solved one after another in a background thread.
+
+    `results` grows as each strategy finishes, after `on_result` has been
+    called with it. `cancel` stops the running search at its next expansion
+    instead of letting it run to completion.
+    """
+
+    def __init__(
+        self,
+        maze: Maze,
+        strategies: SolvingStrategies,
+        on_result: Callable[[SolvingStrategy, StrategyResult], None] | None = None,
+    ):
+        self.strategies = list(strategies)
+        self.results: list[StrategyResult] = []
+        self.running: str | None = None
+        self.error: Exception | None = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(maze, on_result), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, maze: Maze, on_result) -> None:
+        try:
+            for strategy in self.strategies:
+                self.running = strategy_name(strategy)
+                result = run_strategy(
+                    maze.maze, maze.start, maze.end, strategy, cancel=self._cancel
+                )
+                if on_result is not None:
+                    on_result(strategy, result)
+                self.results.append(result)
+        except SolveCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.running = None
+
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+
+def solve_parallel(
+    executor: ProcessPoolExecutor, maze: Maze, strategies: SolvingStrategies
+) -> list[StrategyResult]:
+    job = SolveJob(executor, maze, strategies)
+    return [f.result() for f in job.futures]
+
+
+def solve_seed(
+    maze_config: MazeConfig, num_landmarks: int | None = None
+) -> tuple[int, list[StrategyResult]]:
+    """Generate the maze of one config and run all its strategies on it.
+
+    Landmarks are specific to a maze, so `alt` strategies get theirs here.
+    """
+    maze = build_maze(maze_config)
+    strategies = maze_config.solving_strategies
+    if num_landmarks is not None:
+        heuristic = LandmarkHeuristic(maze_to_grid(maze), maze.start, num_landmarks)
+        strategies = with_landmarks(strategies, heuristic)
+    return maze_config.seed, [
+        run_strategy(maze.maze, maze.start, maze.end, s) for s in strategies
+    ]
+
+
+def make_executor(max_workers: int | None = None) -> ProcessPoolExecutor:
+    # Spawned workers: forking a threaded Streamlit server is not safe
+    return ProcessPoolExecutor(
+        max_workers=max_workers or max(1, (os.cpu_count() or 2) - 1),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
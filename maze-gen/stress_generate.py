@@ -0,0 +1,94 @@
+"""
+Stress concurrent maze generation and check every maze is reproducible.
+
+Each generator builds a reference maze per seed sequentially, then the same
+configurations are generated again many times from a thread pool (as
+Streamlit does with concurrent sessions) while other threads keep reseeding
+the global `random` module. Every concurrent maze must match its reference.
+
+test_generate.py runs a small version of this check with pytest; this script
+is the larger run.
+
+To run:
+> python stress_generate.py --runs 500 --threads 32
+"""
+
+import argparse
+import hashlib
+import random
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from utils import GENERATORS, maze_to_grid
+
+
+def digest(generator: str, seed: int, size: int, num_rooms: int) -> str:
+    maze = GENERATORS[generator](seed, size, size, num_rooms, (3, 6))
+    return hashlib.sha1(np.packbits(maze_to_grid(maze)).tobytes()).hexdigest()
+
+
+def disturb_global_random(stop: threading.Event) -> None:
+    while not stop.is_set():
+        random.seed()
+        random.random()
+
+
+def find_mismatches(
+    runs: int,
+    threads: int,
+    seeds: int = 10,
+    sizes: tuple[int, ...] = (21, 51),
+    rooms: tuple[int, ...] = (0, 3),
+) -> tuple[int, list[tuple]]:
+    """Number of configurations, and the configuration of every concurrent
+    generation that differed from its sequential reference"""
+    configs = list(product(GENERATORS, range(seeds), sizes, rooms))
+    reference = {config: digest(*config) for config in configs}
+    jobs = random.Random(0).choices(configs, k=runs)
+
+    stop = threading.Event()
+    disturbers = [
+        threading.Thread(target=disturb_global_random, args=(stop,)) for _ in range(2)
+    ]
+    for thread in disturbers:
+        thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda config: digest(*config), jobs))
+    finally:
+        stop.set()
+        for thread in disturbers:
+            thread.join()
+
+    return len(configs), [
+        config for config, result in zip(jobs, results) if result != reference[config]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--sizes", type=int, nargs="+", default=(21, 51))
+    parser.add_argument("--rooms", type=int, nargs="+", default=(0, 3))
+    args = parser.parse_args()
+
+    num_configs, mismatches = find_mismatches(
+        args.runs, args.threads, args.seeds, tuple(args.sizes), tuple(args.rooms)
+    )
+    print(
+        f"{args.runs} concurrent generations, {num_configs} configurations, "
+        f"{len(mismatches)} mismatches"
+    )
+    for config in sorted(set(mismatches)):
+        print("  mismatch:", config)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+from stress_generate import find_mismatches
+
+
+def test_concurrent_generation_matches_sequential():
+    _, mismatches = find_mismatches(runs=300, threads=32)
+    assert not mismatches
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from py_wanderer import HEURISTICS, squared_euclidean
+
+from incremental import LPAStar, consistent_heuristic
+from utils import generate_maze, shortest_path_length
+
+
+def random_toggles(planner: LPAStar, count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    size = len(planner.grid)
+    for _ in range(count):
+        cell = tuple(rng.integers(1, size - 1, 2).tolist())
+        if cell not in (planner.start, planner.goal):
+            planner.toggle_wall(cell)
+            planner.compute_shortest_path()
+            yield cell
+
+
+@pytest.mark.parametrize("heuristic", HEURISTICS, ids=lambda h: h.__name__)
+def test_repaired_paths_are_shortest(heuristic):
+    maze = generate_maze(0, 41, 41, 3, (3, 6))
+    planner = LPAStar(maze.maze, maze.start, maze.end, consistent_heuristic(heuristic))
+    planner.compute_shortest_path()
+    for _ in random_toggles(planner, 20):
+        path = planner.path()
+        exact = shortest_path_length(planner.grid, maze.start, maze.end)
+        assert (len(path) - 1 if path else None) == exact
+
+
+def test_path_raises_instead_of_looping_on_inconsistent_g():
+    maze = generate_maze(0, 41, 41, 3, (3, 6))
+    planner = LPAStar(maze.maze, maze.start, maze.end, squared_euclidean)
+    planner.compute_shortest_path()
+    with pytest.raises(RuntimeError):
+        for _ in random_toggles(planner, 50):
+            planner.path()
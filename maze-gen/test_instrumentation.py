@@ -0,0 +1,23 @@
+import pytest
+from py_wanderer import AStar, DepthFirstSearch, manhattan
+
+from instrumentation import solve_counted
+from pathfinding import BidirectionalAStar, JumpPointSearch
+from utils import generate_maze
+
+
+@pytest.mark.parametrize(
+    "algorithm", [AStar, BidirectionalAStar, JumpPointSearch], ids=lambda a: a.__name__
+)
+def test_peak_frontier_is_reported(algorithm):
+    maze = generate_maze(0, 41, 41, 3, (3, 6))
+    path, counters = solve_counted(maze, (algorithm, manhattan))
+    assert path
+    assert counters.expanded_nodes > 0
+    assert counters.peak_frontier > 0
+
+
+def test_peak_frontier_is_empty_without_open_set():
+    maze = generate_maze(0, 41, 41, 3, (3, 6))
+    _, counters = solve_counted(maze, (DepthFirstSearch, manhattan))
+    assert counters.peak_frontier is None
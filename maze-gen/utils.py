@@ -1,10 +1,13 @@
 import random
-from dataclasses import astuple, dataclass
+from collections import deque
+from dataclasses import dataclass
 
+import numpy as np
 from py_wanderer import ALGORITHMS, HEURISTICS, Heuristic, Maze, PathfindingAlgorithm
 
 SolvingStrategy = tuple[PathfindingAlgorithm, Heuristic]
 SolvingStrategies = tuple[SolvingStrategy]
+MazePath = list[tuple[int, int]]
 
 
 @dataclass
@@ -15,9 +18,68 @@ class MazeConfig:
     num_rooms: int
     room_size_range: tuple[int, int]
     solving_strategies: SolvingStrategies = ((ALGORITHMS[0], HEURISTICS[0]),)
+    generator: str = "backtracker"
 
     def __hash__(self):
-        return hash(astuple(self))
+        # Not astuple: it deep-copies every field, heuristics included
+        return hash(
+            (
+                self.seed,
+                self.width,
+                self.height,
+                self.num_rooms,
+                tuple(self.room_size_range),
+                tuple(self.solving_strategies),
+                self.generator,
+            )
+        )
+
+
+class SeededMaze(Maze):
+    """Maze generated from its own `random.Random` instead of the global one.
+
+    Same carving and room placement as `Maze`, so a seed gives the same maze
+    as seeding the global generator did, but concurrent generations (one per
+    Streamlit session thread) no longer share or clobber any state.
+    """
+
+    def __init__(self, *args, seed: int | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rng = random.Random(seed)
+
+    def carve_maze(self, start_x, start_y):
+        stack = [(start_x, start_y)]
+        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+        while stack:
+            x, y = stack.pop()
+            self.rng.shuffle(directions)
+            for dx, dy in directions:
+                nx, ny = x + dx * 2, y + dy * 2
+                if (
+                    1 <= nx < self.width - 1
+                    and 1 <= ny < self.height - 1
+                    and self.maze[ny][nx] == 1
+                ):
+                    self.maze[y + dy][x + dx] = 0
+                    self.maze[ny][nx] = 0
+                    stack.append((nx, ny))
+
+    def add_rooms(self):
+        min_size, max_size = self.room_size_range
+        for _ in range(self.num_rooms):
+            room_width = self.rng.randint(min_size, max_size)
+            room_height = self.rng.randint(min_size, max_size)
+            rx = self.rng.randint(1, self.width - room_width - 2)
+            ry = self.rng.randint(1, self.height - room_height - 2)
+
+            rx = rx if rx % 2 == 1 else rx + 1
+            ry = ry if ry % 2 == 1 else ry + 1
+
+            for i in range(ry, ry + room_height):
+                for j in range(rx, rx + room_width):
+                    if 1 <= i < self.height - 1 and 1 <= j < self.width - 1:
+                        self.maze[i][j] = 0
 
 
 def generate_maze(
@@ -26,12 +88,144 @@ def generate_maze(
     width += width % 2 == 0
     height += height % 2 == 0
     start, end = (1, 1), (height - 2, width - 2)
-    state = random.getstate()
-    random.seed(seed)
-    maze = Maze(width, height, start, end, num_rooms, room_size_range).generate()
-    random.setstate(state)
+    return SeededMaze(
+        width, height, start, end, num_rooms, room_size_range, seed=seed
+    ).generate()
+
+
+def generate_grid(
+    seed: int, width: int, height: int, num_rooms: int, room_size_range: tuple[int, int]
+) -> np.ndarray:
+    """Maze as a uint8 grid (1 = wall), built from a random spanning tree.
+
+    Randomized Kruskal gives the minimum spanning tree of the cell grid under
+    random edge weights; the same tree is found here with Boruvka's algorithm,
+    whose rounds are whole-array operations on the edge index arrays.
+    """
+    width += width % 2 == 0
+    height += height % 2 == 0
+    rng = np.random.default_rng(seed)
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+    cells = np.arange(rows * cols).reshape(rows, cols)
+
+    # Edges between neighbouring cells in random order: position = weight
+    order = rng.permutation(rows * (cols - 1) + (rows - 1) * cols)
+    u = np.concatenate([cells[:, :-1].ravel(), cells[:-1, :].ravel()])[order]
+    v = np.concatenate([cells[:, 1:].ravel(), cells[1:, :].ravel()])[order]
+    u, v = u.astype(np.int32), v.astype(np.int32)
+    rank = np.arange(u.size, dtype=np.int32)
+    in_tree = np.zeros(u.size, dtype=bool)
+
+    # Each round every component takes its lightest edge; endpoints are then
+    # relabelled to the merged components so all arrays shrink round by round
+    n = rows * cols
+    while u.size:
+        lightest = np.full(n, np.iinfo(np.int32).max, dtype=np.int32)
+        np.minimum.at(lightest, u, rank)
+        np.minimum.at(lightest, v, rank)
+        from_u = lightest[u] == rank
+        from_v = lightest[v] == rank
+        in_tree[order[rank[from_u | from_v]]] = True
+
+        # Pairs that chose the same edge point at each other: smaller is root
+        nodes = np.arange(n, dtype=np.int32)
+        parent = nodes.copy()
+        parent[u[from_u]] = v[from_u]
+        parent[v[from_v]] = u[from_v]
+        mutual = (parent[parent] == nodes) & (nodes < parent)
+        parent[mutual] = nodes[mutual]
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+        is_root = parent == nodes
+        label = (np.cumsum(is_root, dtype=np.int32) - 1)[parent]
+        u, v = label[u], label[v]
+        crossing = u != v
+        u, v, rank = u[crossing], v[crossing], rank[crossing]
+        n = int(is_root.sum())
+
+    grid = np.ones((height, width), dtype=np.uint8)
+    grid[1:-1:2, 1:-1:2] = 0
+    n_horizontal = rows * (cols - 1)
+    tree_edges = np.flatnonzero(in_tree)
+    horizontal = tree_edges[tree_edges < n_horizontal]
+    vertical = tree_edges[tree_edges >= n_horizontal] - n_horizontal
+    r, c = np.divmod(horizontal, cols - 1)
+    grid[2 * r + 1, 2 * c + 2] = 0
+    r, c = np.divmod(vertical, cols)
+    grid[2 * r + 2, 2 * c + 1] = 0
+
+    min_size, max_size = room_size_range
+    for _ in range(num_rooms):
+        room_width, room_height = rng.integers(min_size, max_size + 1, 2)
+        rx = rng.integers(1, max(2, width - room_width - 1))
+        ry = rng.integers(1, max(2, height - room_height - 1))
+        rx += rx % 2 == 0
+        ry += ry % 2 == 0
+        grid[ry : ry + room_height, rx : rx + room_width] = 0
+
+    grid[[0, -1], :] = 1
+    grid[:, [0, -1]] = 1
+    return grid
+
+
+def grid_to_maze(
+    grid: np.ndarray, num_rooms: int = 0, room_size_range: tuple[int, int] = (3, 6)
+) -> Maze:
+    height, width = grid.shape
+    maze = Maze(
+        width, height, (1, 1), (height - 2, width - 2), num_rooms, room_size_range
+    )
+    maze.maze = grid.tolist()
     return maze
 
 
+def maze_to_grid(maze: Maze) -> np.ndarray:
+    return np.asarray(maze.maze, dtype=np.uint8)
+
+
+GENERATORS = {
+    "backtracker": generate_maze,
+    "kruskal": lambda *args: grid_to_maze(generate_grid(*args), *args[3:]),
+}
+
+
+def build_maze(maze_config: MazeConfig) -> Maze:
+    return GENERATORS[maze_config.generator](
+        maze_config.seed,
+        maze_config.width,
+        maze_config.height,
+        maze_config.num_rooms,
+        maze_config.room_size_range,
+    )
+
+
 def solve_maze(maze: Maze, strategies: SolvingStrategies):
     return maze.solve_many(list(strategies))
+
+
+def shortest_path_length(
+    grid: list[list[int]], start: tuple[int, int], end: tuple[int, int]
+) -> int | None:
+    """Exact shortest path length (BFS), None if `end` is unreachable"""
+    height, width = len(grid), len(grid[0])
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == end:
+            return dist[node]
+        x, y = node
+        for nx, ny in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+            if (
+                0 <= nx < height
+                and 0 <= ny < width
+                and grid[nx][ny] == 0
+                and (nx, ny) not in dist
+            ):
+                dist[(nx, ny)] = dist[node] + 1
+                queue.append((nx, ny))
+    return None